@@ -0,0 +1,48 @@
+"""Headless batch conversion with the Sonic Adventure I/O addon.
+
+Usage:
+    blender -b --python batch_convert.py -- manifest.json [--stop-on-error]
+"""
+
+import os
+import sys
+import importlib
+import traceback
+
+import addon_utils
+
+
+def _find_addon_module():
+    directory = os.path.dirname(os.path.realpath(__file__))
+
+    for module in addon_utils.modules():
+        module_directory = os.path.dirname(os.path.realpath(module.__file__))
+        if module_directory == directory:
+            return module.__name__
+
+    return None
+
+
+def _convert():
+    module_name = _find_addon_module()
+    if module_name is None:
+        print("Sonic Adventure I/O is not installed as an addon!")
+        return 2
+
+    addon_utils.enable(module_name, default_set=False)
+    convert = importlib.import_module(module_name + ".source.batch.convert")
+
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    return convert.main(argv)
+
+
+def _run():
+    # exceptions escaping the script would make blender exit with 0
+    try:
+        return _convert()
+    except Exception: # pylint: disable=broad-exception-caught
+        traceback.print_exc()
+        return 1
+
+
+sys.exit(_run())
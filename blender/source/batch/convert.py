@@ -0,0 +1,403 @@
+import os
+import json
+import time
+import argparse
+
+import bpy
+
+from .coordinator import WorkerPool
+from ..dotnet import load_dotnet
+from ..utility.general import get_path
+from ..exceptions import UserException
+
+IMPORT_OPERATORS = {
+    ".sa1mdl": "saio.import_mdl",
+    ".sadxmdl": "saio.import_mdl",
+    ".sa2mdl": "saio.import_mdl",
+    ".sa2bmdl": "saio.import_mdl",
+    ".nj": "saio.import_mdl",
+    ".sa1lvl": "saio.import_lvl",
+    ".sadxlvl": "saio.import_lvl",
+    ".sa2lvl": "saio.import_lvl",
+    ".sa2blvl": "saio.import_lvl",
+}
+'''Import operators by file extension, for inputs that are not .blend files'''
+
+
+class BatchOutput:
+    '''A single export of a batch job'''
+
+    operator: str
+    filepath: str
+    options: dict[str, any]
+
+    def __init__(self, operator: str, filepath: str, options: dict[str, any]):
+        self.operator = operator
+        self.filepath = filepath
+        self.options = options
+
+
+class BatchJob:
+    '''An input file and the exports to create from it'''
+
+    index: int
+    input: str
+    scene: str | None
+    import_operator: str | None
+    import_options: dict[str, any]
+    outputs: list[BatchOutput]
+
+    def __init__(self, index: int, input_filepath: str):
+        self.index = index
+        self.input = input_filepath
+        self.scene = None
+        self.import_operator = None
+        self.import_options = {}
+        self.outputs = []
+
+    @property
+    def name(self):
+        return os.path.basename(self.input)
+
+
+class BatchResult:
+    '''Outcome of a single export'''
+
+    job: BatchJob
+    output: BatchOutput | None
+    '''None for the result of loading the input, when loading failed or the
+    job has no outputs'''
+    success: bool
+    seconds: float
+    message: str
+
+    def __init__(
+            self,
+            job: BatchJob,
+            output: BatchOutput | None,
+            success: bool,
+            seconds: float,
+            message: str = ""):
+
+        self.job = job
+        self.output = output
+        self.success = success
+        self.seconds = seconds
+        self.message = message
+
+    def to_dict(self):
+        return {
+            "job": self.job.index,
+            "input": self.job.input,
+            "output": None if self.output is None else self.output.filepath,
+            "success": self.success,
+            "seconds": self.seconds,
+            "message": self.message,
+        }
+
+
+def _to_operator_name(name: str):
+    if "." not in name:
+        return "saio." + name
+    return name
+
+
+def _get_operator(name: str):
+    category, operator = name.split(".", 1)
+    return getattr(getattr(bpy.ops, category), operator)
+
+
+def _resolve_path(directory: str, filepath: str):
+    return os.path.normpath(os.path.join(directory, filepath))
+
+
+_JSON_TYPE_NAMES = {
+    dict: "an object",
+    list: "a list",
+    str: "a string",
+}
+
+
+def _expect_type(value, value_type: type, description: str):
+    if not isinstance(value, value_type):
+        raise UserException(
+            f"{description} has to be {_JSON_TYPE_NAMES[value_type]}!")
+    return value
+
+
+def read_manifest(filepath: str):
+    '''Reads the jobs from a manifest file. Relative paths are resolved
+    relative to the manifest'''
+
+    try:
+        with open(filepath, "r", encoding="utf-8") as file:
+            manifest = json.load(file)
+    except (OSError, ValueError) as error:
+        raise UserException(
+            f"Failed to read manifest \"{filepath}\": {error}") from error
+
+    _expect_type(manifest, dict, "The manifest")
+
+    directory = os.path.dirname(os.path.abspath(filepath))
+    defaults = _expect_type(
+        manifest.get("defaults", {}), dict, "\"defaults\"")
+    jobs: list[BatchJob] = []
+
+    job_list = _expect_type(manifest.get("jobs", []), list, "\"jobs\"")
+    for index, job_data in enumerate(job_list):
+        _expect_type(job_data, dict, f"Job {index}")
+
+        if "input" not in job_data:
+            raise UserException(f"Job {index} has no input file!")
+
+        job = BatchJob(index, _resolve_path(
+            directory,
+            _expect_type(job_data["input"], str, f"Input of job {index}")))
+
+        job.scene = job_data.get("scene", None)
+        if job.scene is not None:
+            _expect_type(job.scene, str, f"Scene of job {index}")
+
+        if "import" in job_data:
+            import_data = _expect_type(
+                job_data["import"], dict, f"Import of job {index}")
+
+            if "operator" not in import_data:
+                raise UserException(f"Job {index} has an import without operator!")
+
+            job.import_operator = _to_operator_name(_expect_type(
+                import_data["operator"], str,
+                f"Import operator of job {index}"))
+
+            job.import_options = _expect_type(
+                import_data.get("options", {}), dict,
+                f"Import options of job {index}")
+
+        output_list = _expect_type(
+            job_data.get("outputs", []), list, f"Outputs of job {index}")
+
+        for output_data in output_list:
+            _expect_type(output_data, dict, f"Output of job {index}")
+
+            if "operator" not in output_data or "filepath" not in output_data:
+                raise UserException(
+                    f"Job {index} has an output without operator or filepath!")
+
+            operator = _to_operator_name(_expect_type(
+                output_data["operator"], str, f"Output operator of job {index}"))
+            _expect_type(
+                output_data["filepath"], str, f"Output filepath of job {index}")
+
+            options = dict(_expect_type(
+                defaults.get(operator, {}), dict,
+                f"Defaults of \"{operator}\""))
+            options.update(_expect_type(
+                output_data.get("options", {}), dict,
+                f"Output options of job {index}"))
+
+            job.outputs.append(BatchOutput(
+                operator,
+                _resolve_path(directory, output_data["filepath"]),
+                options))
+
+        jobs.append(job)
+
+    return jobs
+
+
+def _load_input(job: BatchJob):
+    if job.import_operator is None and job.input.lower().endswith(".blend"):
+        bpy.ops.wm.open_mainfile(filepath=job.input)
+        return
+
+    operator = job.import_operator
+    if operator is None:
+        extension = os.path.splitext(job.input)[1].lower()
+        if extension not in IMPORT_OPERATORS:
+            raise UserException(
+                f"No import operator known for \"{extension}\" files!")
+        operator = IMPORT_OPERATORS[extension]
+
+    bpy.ops.wm.read_homefile(use_empty=True)
+
+    result = _get_operator(operator)(
+        'EXEC_DEFAULT',
+        filepath=job.input,
+        files=[{"name": os.path.basename(job.input)}],
+        **job.import_options)
+
+    if 'FINISHED' not in result:
+        raise UserException(f"Importing \"{job.input}\" was cancelled")
+
+
+def _run_export(job: BatchJob, output: BatchOutput):
+    os.makedirs(os.path.dirname(output.filepath), exist_ok=True)
+    operator = _get_operator(output.operator)
+
+    if job.scene is None:
+        scene = bpy.context.scene
+    elif job.scene in bpy.data.scenes:
+        scene = bpy.data.scenes[job.scene]
+    else:
+        raise UserException(f"Scene \"{job.scene}\" does not exist!")
+
+    with bpy.context.temp_override(scene=scene):
+        result = operator(
+            'EXEC_DEFAULT',
+            filepath=output.filepath,
+            **output.options)
+
+    if 'FINISHED' not in result:
+        raise UserException(f"Export to \"{output.filepath}\" was cancelled")
+
+
+def run_job(job: BatchJob, log):
+    '''Loads the input of a job and runs all of its exports'''
+
+    results: list[BatchResult] = []
+
+    start = time.perf_counter()
+    try:
+        _load_input(job)
+    except Exception as error: # pylint: disable=broad-exception-caught
+        seconds = time.perf_counter() - start
+        log(f"    failed to load input ({seconds:.2f}s): {error}")
+        results.append(BatchResult(job, None, False, seconds, str(error)))
+        return results
+
+    seconds = time.perf_counter() - start
+    log(f"    loaded input ({seconds:.2f}s)")
+
+    if len(job.outputs) == 0:
+        # every job reports at least one result, so that workers can tell
+        # a job without outputs apart from one that was never reached
+        results.append(BatchResult(job, None, True, seconds, "No outputs"))
+        return results
+
+    for output in job.outputs:
+        start = time.perf_counter()
+        try:
+            _run_export(job, output)
+        except Exception as error: # pylint: disable=broad-exception-caught
+            seconds = time.perf_counter() - start
+            log(f"    {output.operator} -> {output.filepath}"
+                f" FAILED ({seconds:.2f}s): {error}")
+            results.append(BatchResult(job, output, False, seconds, str(error)))
+            continue
+
+        seconds = time.perf_counter() - start
+        log(f"    {output.operator} -> {output.filepath} ok ({seconds:.2f}s)")
+        results.append(BatchResult(job, output, True, seconds))
+
+    return results
+
+
+def run_jobs(jobs: list[BatchJob], stop_on_error: bool = False, log=print):
+    '''Runs all jobs in the current blender instance, with the .NET runtime
+    being loaded only once for all of them'''
+
+    start = time.perf_counter()
+    load_dotnet()
+    log(f"Loaded .NET runtime ({time.perf_counter() - start:.2f}s)")
+
+    results: list[BatchResult] = []
+
+    for number, job in enumerate(jobs, 1):
+        log(f"[{number}/{len(jobs)}] {job.input}")
+        job_results = run_job(job, log)
+        results.extend(job_results)
+
+        if stop_on_error and not all(result.success for result in job_results):
+            log("Stopping after failed job")
+            break
+
+    failed = sum(1 for result in results if not result.success)
+    log(f"Finished {len(results) - failed}/{len(results)} exports"
+        f" in {time.perf_counter() - start:.2f}s")
+
+    return results
+
+
+def _parse_arguments(argv: list[str]):
+    parser = argparse.ArgumentParser(
+        prog="blender -b --python batch_convert.py --",
+        description="Converts files with the Sonic Adventure I/O addon")
+
+    parser.add_argument(
+        "manifest",
+        help="JSON file listing the input files and their exports")
+
+    parser.add_argument(
+        "--stop-on-error",
+        action="store_true",
+        help="Stop at the first job that failed")
+
+    parser.add_argument(
+        "--jobs",
+        help="Comma separated indices of the manifest jobs to run (default: all)")
+
+    parser.add_argument(
+        "--report",
+        help="Write the results of all exports to this JSON file")
+
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of background blender processes to convert with")
+
+    parser.add_argument(
+        "--retries",
+        type=int,
+        default=1,
+        help="How often failed jobs get retried when using multiple workers")
+
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=None,
+        help=(
+            "Seconds after which a worker gets stopped and its unfinished"
+            " jobs count as failed, when using multiple workers"))
+
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str]):
+    '''Entry point for batch conversion. Returns the process exit code:
+    0 if all exports succeeded, 1 if any failed and 2 for invalid arguments'''
+
+    try:
+        arguments = _parse_arguments(argv)
+    except SystemExit as exit_error:
+        return 0 if exit_error.code == 0 else 2
+
+    try:
+        jobs = read_manifest(arguments.manifest)
+        if arguments.jobs:
+            indices = {int(index) for index in arguments.jobs.split(",")}
+            jobs = [job for job in jobs if job.index in indices]
+    except (UserException, ValueError) as error:
+        print(f"Error: {error}")
+        return 2
+
+    if arguments.workers > 1:
+        pool = WorkerPool(
+            bpy.app.binary_path,
+            os.path.join(get_path(), "batch_convert.py"),
+            arguments.manifest,
+            arguments.workers,
+            arguments.retries,
+            arguments.timeout)
+
+        results = pool.run([job.index for job in jobs])
+    else:
+        results = [
+            result.to_dict()
+            for result in run_jobs(jobs, arguments.stop_on_error)]
+
+    if arguments.report:
+        with open(arguments.report, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+
+    return 0 if all(result["success"] for result in results) else 1
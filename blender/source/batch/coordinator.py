@@ -0,0 +1,166 @@
+import os
+import json
+import math
+import time
+import tempfile
+import itertools
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+CHUNKS_PER_WORKER = 4
+'''Jobs get split into chunks, so that workers which finish early can take
+over more work. Each chunk starts a new blender process, so too many small
+chunks waste time on startup'''
+
+
+def _split_chunks(indices: list[int], worker_count: int):
+    chunk_size = max(1, math.ceil(
+        len(indices) / (worker_count * CHUNKS_PER_WORKER)))
+
+    return [
+        indices[i:i + chunk_size]
+        for i in range(0, len(indices), chunk_size)]
+
+
+class WorkerPool:
+    '''Distributes batch jobs across multiple background blender processes,
+    as a single blender process can only convert one file at a time'''
+
+    blender_path: str
+    script_path: str
+    manifest: str
+    worker_count: int
+    retries: int
+    timeout: float | None
+    '''Seconds after which a worker gets stopped, to not wait on a hung
+    process forever. None to wait indefinitely'''
+    log: any
+
+    def __init__(
+            self,
+            blender_path: str,
+            script_path: str,
+            manifest: str,
+            worker_count: int,
+            retries: int,
+            timeout: float | None = None,
+            log=print):
+
+        self.blender_path = blender_path
+        self.script_path = script_path
+        self.manifest = os.path.abspath(manifest)
+        self.worker_count = worker_count
+        self.retries = retries
+        self.timeout = timeout
+        self.log = log
+
+    def _run_chunk(self, chunk: list[int], attempt: int):
+        with tempfile.TemporaryDirectory() as directory:
+            report = os.path.join(directory, "report.json")
+
+            start = time.perf_counter()
+            try:
+                process = subprocess.run(
+                    [
+                        self.blender_path,
+                        "-b",
+                        "--python", self.script_path,
+                        "--",
+                        self.manifest,
+                        "--jobs", ",".join(str(index) for index in chunk),
+                        "--report", report
+                    ],
+                    capture_output=True,
+                    text=True,
+                    check=False,
+                    timeout=self.timeout)
+
+                exit_message = f"Worker exited with code {process.returncode}"
+                stdout, stderr = process.stdout, process.stderr
+
+            except subprocess.TimeoutExpired as error:
+                # the worker gets killed; its report is written last, so
+                # none of the jobs have results and all get retried
+                exit_message = f"Worker timed out after {self.timeout}s"
+                stdout, stderr = error.stdout, error.stderr
+
+            seconds = time.perf_counter() - start
+
+            results = []
+            if os.path.isfile(report):
+                with open(report, "r", encoding="utf-8") as file:
+                    results = json.load(file)
+
+        # jobs without results were not reached, e.g. due to a crash
+        reported = {result["job"] for result in results}
+        for index in chunk:
+            if index not in reported:
+                results.append({
+                    "job": index,
+                    "input": None,
+                    "output": None,
+                    "success": False,
+                    "seconds": 0,
+                    "message": f"{exit_message} before the job finished",
+                })
+
+        for result in results:
+            result["attempt"] = attempt
+
+        failed = sum(1 for result in results if not result["success"])
+        job_list = ", ".join(str(index) for index in chunk)
+        self.log(
+            f"Jobs {job_list} finished in {seconds:.2f}s"
+            f" ({len(results) - failed}/{len(results)} exports succeeded)")
+
+        if failed > 0:
+            for output in (stdout, stderr):
+                if isinstance(output, bytes):
+                    output = output.decode(errors="replace")
+                if output and output.strip():
+                    self.log(output.rstrip())
+
+        return results
+
+    def run(self, job_indices: list[int]):
+        '''Runs the jobs on the workers and returns the results of their
+        last attempt'''
+
+        start = time.perf_counter()
+        results: dict[int, list[dict]] = {}
+        pending = list(job_indices)
+
+        for attempt in range(self.retries + 1):
+            if len(pending) == 0:
+                break
+
+            if attempt > 0:
+                self.log(f"Retrying {len(pending)} failed job(s)")
+
+            chunks = _split_chunks(pending, self.worker_count)
+            worker_count = min(self.worker_count, len(chunks))
+
+            with ThreadPoolExecutor(max_workers=worker_count) as executor:
+                for chunk_results in executor.map(
+                        self._run_chunk, chunks, itertools.repeat(attempt)):
+
+                    for index in {result["job"] for result in chunk_results}:
+                        results[index] = [
+                            result for result in chunk_results
+                            if result["job"] == index]
+
+            pending = [
+                index for index in pending
+                if not all(result["success"] for result in results[index])]
+
+        merged = [
+            result
+            for index in job_indices
+            for result in results[index]]
+
+        failed = sum(1 for result in merged if not result["success"])
+        self.log(
+            f"Finished {len(merged) - failed}/{len(merged)} exports on"
+            f" {self.worker_count} workers in {time.perf_counter() - start:.2f}s")
+
+        return merged
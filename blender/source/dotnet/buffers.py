@@ -0,0 +1,50 @@
+import ctypes
+import numpy
+
+from .system import System
+
+
+def _get_net_type(dtype: numpy.dtype):
+    if dtype == numpy.float32:
+        return System.SINGLE
+    elif dtype == numpy.int32:
+        return System.INT32
+    elif dtype == numpy.uint8:
+        return System.BYTE
+
+    raise TypeError(f"No .NET array type for numpy dtype \"{dtype}\"")
+
+
+def _copy_pinned(net_array, address: int, nbytes: int, to_net: bool):
+    if nbytes == 0:
+        return
+
+    handle = System.GC_HANDLE.Alloc(net_array, System.GC_HANDLE_TYPE.Pinned)
+    try:
+        net_address = handle.AddrOfPinnedObject().ToInt64()
+        if to_net:
+            ctypes.memmove(net_address, address, nbytes)
+        else:
+            ctypes.memmove(address, net_address, nbytes)
+    finally:
+        handle.Free()
+
+
+def to_net_array(array: numpy.ndarray):
+    '''Copies a numpy array into a new, flat .NET array in a single memory
+    transfer, instead of letting pythonnet convert it element by element'''
+
+    array = numpy.ascontiguousarray(array)
+    net_array = System.ARRAY.CreateInstance(
+        _get_net_type(array.dtype), array.size)
+
+    _copy_pinned(net_array, array.ctypes.data, array.nbytes, True)
+    return net_array
+
+
+def to_numpy_array(net_array, dtype: numpy.dtype):
+    '''Copies a flat .NET array of primitive values into a new numpy array'''
+
+    result = numpy.empty(net_array.Length, dtype=dtype)
+    _copy_pinned(net_array, result.ctypes.data, result.nbytes, False)
+    return result
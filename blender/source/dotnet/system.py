@@ -13,6 +13,12 @@ class System:
     UINT32: any = None
     '''struct System.UInt32'''
 
+    SINGLE: any = None
+    '''struct System.Single'''
+
+    BYTE: any = None
+    '''struct System.Byte'''
+
     VECTOR3: any = None
     '''struct System.Numerics.Vector3'''
 
@@ -37,6 +43,12 @@ class System:
     FILE: any = None
     '''class System.IO.File'''
 
+    GC_HANDLE: any = None
+    '''struct System.Runtime.InteropServices.GCHandle'''
+
+    GC_HANDLE_TYPE: any = None
+    '''enum System.Runtime.InteropServices.GCHandleType'''
+
     @classmethod
     def load(cls):
 
@@ -45,6 +57,8 @@ class System:
             Int16,
             Int32,
             UInt32,
+            Single,
+            Byte,
             Array
         )
 
@@ -59,10 +73,17 @@ class System:
 
         from System.IO import File  # pylint: disable=import-error
 
+        from System.Runtime.InteropServices import (  # pylint: disable=import-error
+            GCHandle,
+            GCHandleType
+        )
+
         cls.VALUE_TUPLE = ValueTuple
         cls.INT16 = Int16
         cls.INT32 = Int32
         cls.UINT32 = UInt32
+        cls.SINGLE = Single
+        cls.BYTE = Byte
         cls.VECTOR3 = Vector3
         cls.VECTOR2 = Vector2
         cls.MATRIX4X4 = Matrix4x4
@@ -71,6 +92,8 @@ class System:
         cls.DICTIONARY = Dictionary
         cls.SORTED_DICTIONARY = SortedDictionary
         cls.FILE = File
+        cls.GC_HANDLE = GCHandle
+        cls.GC_HANDLE_TYPE = GCHandleType
 
     @classmethod
     def unload(cls):
@@ -78,6 +101,8 @@ class System:
         cls.INT16 = None
         cls.INT32 = None
         cls.UINT32 = None
+        cls.SINGLE = None
+        cls.BYTE = None
         cls.VECTOR3 = None
         cls.VECTOR2 = None
         cls.MATRIX4X4 = None
@@ -86,3 +111,5 @@ class System:
         cls.DICTIONARY = None
         cls.SORTED_DICTIONARY = None
         cls.File = None
+        cls.GC_HANDLE = None
+        cls.GC_HANDLE_TYPE = None
@@ -1,5 +1,6 @@
 import math
 import bpy
+import numpy
 from bpy.types import FCurve, ActionChannelbag
 from mathutils import Vector, Matrix, Quaternion, Euler
 
@@ -572,27 +573,27 @@ class ShapeKeyframeEvaluator:
 
         return frames
 
+    def _get_shape_vectors(self, vectors: numpy.ndarray, matrix: Matrix):
+        vectors = vectors @ numpy.array(matrix.to_3x3(), dtype=numpy.float32).T
+        if len(matrix) == 4:
+            vectors += numpy.array(matrix.translation, dtype=numpy.float32)
+
+        if self._modelmesh.vertex_mapping is not None:
+            vectors = vectors[self._modelmesh.vertex_mapping]
+
+        return [System.VECTOR3(x, z, -y) for x, y, z in vectors.tolist()]
+
     def _create_vertex_array(
             self,
             shape_name: str,
             mesh: bpy.types.Mesh,
             matrix: Matrix, ):
 
-        def get_position(vertex):
-            position = matrix @ vertex.co
-            return System.VECTOR3(
-                position.x,
-                position.z,
-                -position.y,
-            )
+        positions = numpy.empty(len(mesh.vertices) * 3, dtype=numpy.float32)
+        mesh.vertices.foreach_get("co", positions)
 
-        if self._modelmesh.vertex_mapping is not None:
-            shape_positions = [
-                get_position(mesh.vertices[vertex_index])
-                for vertex_index in self._modelmesh.vertex_mapping]
-        else:
-            shape_positions = [get_position(vertex)
-                               for vertex in mesh.vertices]
+        shape_positions = self._get_shape_vectors(
+            positions.reshape(-1, 3), matrix)
 
         return SA3D_Common.LABELED_ARRAY[System.VECTOR3](
             shape_name.lower(), shape_positions)
@@ -609,22 +610,8 @@ class ShapeKeyframeEvaluator:
         if self._normal_mode == 'NULLED':
             shape_normals = [System.VECTOR3(0, 0, 0)]
         else:  # 'FULL'
-            normals = ModelMesh.get_normals(mesh)
-
-            def get_normal(normal):
-                normal = matrix @ normal
-                return System.VECTOR3(
-                    normal.x,
-                    normal.z,
-                    -normal.y,
-                )
-
-            if self._modelmesh.vertex_mapping is not None:
-                shape_normals = [
-                    get_normal(normals[vertex_index])
-                    for vertex_index in self._modelmesh.vertex_mapping]
-            else:
-                shape_normals = [get_normal(normal) for normal in normals]
+            shape_normals = self._get_shape_vectors(
+                ModelMesh.get_normals(mesh), matrix)
 
         normal_name = (
             shape_name
@@ -27,6 +27,7 @@ class LandtableEvaluator:
     _anim_objects: list[set[bpy.types.Object]]
 
     _mesh_lut: dict[bpy.types.Object | bpy.types.Mesh, int]
+    _entry_objects: list[tuple[bpy.types.Object, int]]
     _land_entries: list
     _temp_objects: list[bpy.types.Object]
     _modelmeshes: list[o_mesh.ModelMesh]
@@ -62,6 +63,7 @@ class LandtableEvaluator:
         self._anim_objects = list()
 
         self._mesh_lut = {}
+        self._entry_objects = []
         self._land_entries = []
         self._temp_objects = []
         self._modelmeshes = []
@@ -71,6 +73,7 @@ class LandtableEvaluator:
 
     def _setup(self):
         self._mesh_lut.clear()
+        self._entry_objects.clear()
         self._land_entries.clear()
         self._temp_objects.clear()
         self._modelmeshes.clear()
@@ -117,8 +120,7 @@ class LandtableEvaluator:
 
         return mesh_index
 
-    def _eval_entry(self, obj: bpy.types.Object):
-        mesh_index = self._eval_mesh_index(obj)
+    def _create_entry(self, obj: bpy.types.Object, mesh_index: int):
         blockbit = int(obj.saio_land_entry.blockbit, base=16)
 
         surface_attributes = o_enum.to_surface_attributes(
@@ -140,6 +142,10 @@ class LandtableEvaluator:
 
         self._land_entries.append(landentry)
 
+    def _eval_entries(self):
+        for obj, mesh_index in self._entry_objects:
+            self._create_entry(obj, mesh_index)
+
     def _eval_mesh_models(self):
         for mesh in self._mesh_lut:
             mesh_obj = mesh
@@ -160,9 +166,33 @@ class LandtableEvaluator:
 
         # we apply modifiers here since the only models with modifiers
         # are those that we added before based on whether we apply modifiers
-        self._mesh_structs = o_mesh.ModelMesh.evaluate_models(
+        mesh_structs = o_mesh.ModelMesh.evaluate_models(
             self._context, self._modelmeshes, True, False)
 
+        self._dedupe_mesh_structs(mesh_structs)
+
+    def _dedupe_mesh_structs(self, mesh_structs: list):
+        # Objects duplicated without linking the mesh data still convert to
+        # identical meshes, which only need to be stored once
+
+        self._mesh_structs = []
+        content_lut: dict[tuple, int] = {}
+        index_map = []
+
+        for model, mesh_struct in zip(self._modelmeshes, mesh_structs):
+            if model.content_key in content_lut:
+                index_map.append(content_lut[model.content_key])
+                continue
+
+            mesh_index = len(self._mesh_structs)
+            content_lut[model.content_key] = mesh_index
+            index_map.append(mesh_index)
+            self._mesh_structs.append(mesh_struct)
+
+        self._entry_objects = [
+            (obj, index_map[mesh_index])
+            for obj, mesh_index in self._entry_objects]
+
     def _cleanup(self):
         for temp in self._temp_objects:
             bpy.data.objects.remove(temp)
@@ -232,9 +262,10 @@ class LandtableEvaluator:
 
         for obj in sorted(self._le_objects, key=lambda x: x.name.lower()):
             if obj.type == 'MESH' and len(obj.data.polygons) > 0:
-                self._eval_entry(obj)
+                self._entry_objects.append((obj, self._eval_mesh_index(obj)))
 
         self._eval_mesh_models()
+        self._eval_entries()
         self._cleanup()
 
     def save_debug(self, filepath: str):
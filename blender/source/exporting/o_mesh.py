@@ -1,15 +1,445 @@
+import os
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+
 import bpy
-from mathutils import Matrix, Vector
+import numpy
+from mathutils import Matrix
 
 from .o_node import NodeStructure
+from .o_mesh_cache import MeshConversionCache, get_mesh_cache
 
 from ..utility.texture_manager import TexlistManager
-from ..utility.color_utils import linear_to_srgb
+from ..utility.color_utils import linear_to_srgb_array
 from ..utility.math_utils import get_normal_matrix
-from ..dotnet import System, SA3D_Modeling, SAIO_NET
+from ..dotnet import SAIO_NET
+from ..dotnet.buffers import to_net_array
 
 from ..exceptions import SAIOException
 
+_AXIS_SWAP = numpy.array(
+    ((1, 0, 0),
+     (0, 0, 1),
+     (0, -1, 0)),
+    dtype=numpy.float32)
+'''Converts blender space (Z up) to SA space (Y up); (x, y, z) -> (x, z, -y)'''
+
+
+def _to_net_space(
+        vectors: numpy.ndarray,
+        matrix: numpy.ndarray | None = None):
+    '''Transforms an (N, 3) vector array with an optional 3x3 or 4x4 matrix
+    and converts it to SA space, all in one batched multiplication'''
+
+    linear = _AXIS_SWAP
+    offset = None
+
+    if matrix is not None:
+        linear = _AXIS_SWAP @ matrix[:3, :3]
+        if len(matrix) == 4:
+            offset = _AXIS_SWAP @ matrix[:3, 3]
+
+    result = vectors @ linear.T
+    if offset is not None:
+        result += offset
+
+    return result
+
+
+class MeshArrays:
+    '''Mesh data read from blender. Converting it to a mesh struct does not
+    access blender data, and can thus be done outside of the main thread'''
+
+    name: str
+
+    positions: numpy.ndarray
+    normals: numpy.ndarray
+    vertex_matrix: numpy.ndarray | None
+    normal_matrix: numpy.ndarray | None
+
+    weight_num: int
+    weight_offsets: numpy.ndarray | None
+    '''CSR offsets; The weights of vertex i are in [offsets[i], offsets[i+1])'''
+    weight_slots: numpy.ndarray | None
+    '''Weight index of each CSR entry; -1 for non-depending groups'''
+    weight_values: numpy.ndarray | None
+
+    corner_vertices: numpy.ndarray
+    corner_edges: numpy.ndarray | None
+    '''Only set if the mesh has vertices to split along sharp edges'''
+    corner_normals: numpy.ndarray | None
+    split_edges: numpy.ndarray | None
+    '''Per edge; Whether corners should not be connected across it'''
+    uvs: numpy.ndarray
+    colors: numpy.ndarray | None
+    point_colors: bool
+    polygon_sizes: numpy.ndarray
+    triangle_corners: numpy.ndarray
+    '''Corner indices of the mesh loop triangles; 3 per triangle'''
+    triangle_materials: numpy.ndarray
+    materials: list
+
+    root_index: int
+    has_vertex_colors: bool
+    force_vertex_colors: bool
+    texcoord_precision_level: int
+    no_bounds: bool
+
+    vertex_sources: numpy.ndarray | None
+    '''Output; Source vertex index of every converted vertex. None if no
+    vertices were split'''
+
+    _hash: str | None
+
+    def __init__(self, name: str):
+        self.name = name
+
+        self.positions = None
+        self.normals = None
+        self.vertex_matrix = None
+        self.normal_matrix = None
+
+        self.weight_num = 0
+        self.weight_offsets = None
+        self.weight_slots = None
+        self.weight_values = None
+
+        self.corner_vertices = None
+        self.corner_edges = None
+        self.corner_normals = None
+        self.split_edges = None
+        self.uvs = None
+        self.colors = None
+        self.point_colors = False
+        self.polygon_sizes = None
+        self.triangle_corners = None
+        self.triangle_materials = None
+        self.materials = []
+
+        self.root_index = 0
+        self.has_vertex_colors = False
+        self.force_vertex_colors = False
+        self.texcoord_precision_level = 0
+        self.no_bounds = False
+
+        self.vertex_sources = None
+
+        self._hash = None
+
+    def _get_weights(self):
+        if self.weight_offsets is None:
+            return None
+
+        vertex_count = len(self.positions)
+        rows = numpy.repeat(
+            numpy.arange(vertex_count), numpy.diff(self.weight_offsets))
+
+        valid = (self.weight_slots >= 0) & (self.weight_values > 0)
+        rows = rows[valid]
+        slots = self.weight_slots[valid]
+        values = self.weight_values[valid]
+
+        # normalizing; vertices without weights get fully assigned to the root
+        totals = numpy.bincount(rows, weights=values, minlength=vertex_count)
+
+        weights = numpy.zeros(
+            (vertex_count, self.weight_num), dtype=numpy.float32)
+        weights[rows, slots] = values / totals[rows]
+        weights[totals == 0, 0] = 1
+
+        return weights
+
+    def _get_corner_colors(self):
+        if self.colors is None:
+            return numpy.ones(
+                (len(self.corner_vertices), 4), dtype=numpy.float32)
+
+        colors = self.colors
+        if self.point_colors:
+            colors = colors[self.corner_vertices]
+
+        return linear_to_srgb_array(colors)
+
+    def _get_corner_uvs(self):
+        uvs = self.uvs.copy()
+        uvs[:, 1] = 1 - uvs[:, 1]
+        return uvs
+
+    def _get_corner_sets(self):
+        # Bucketing the triangle corners by material. A stable sort keeps
+        # the triangles of each material in their original order
+
+        corner_materials = numpy.repeat(
+            numpy.clip(self.triangle_materials, 0, len(self.materials) - 1),
+            3)
+
+        corners = self.triangle_corners[
+            numpy.argsort(corner_materials, kind="stable")]
+        set_lengths = numpy.bincount(
+            corner_materials, minlength=len(self.materials))
+
+        used = numpy.flatnonzero(set_lengths)
+        if len(used) == 0:
+            raise SAIOException("Empty mesh!")
+
+        return (
+            corners,
+            set_lengths[used].astype(numpy.int32),
+            used.astype(numpy.int32)
+        )
+
+    def _get_corner_components(self):
+        # Corners around a vertex are connected through the edges they share.
+        # Labels are propagated along those connections until every corner
+        # holds the lowest corner index of its connected component
+
+        corner_count = len(self.corner_vertices)
+        corner_indices = numpy.arange(corner_count)
+
+        polygon_starts = numpy.cumsum(self.polygon_sizes) - self.polygon_sizes
+        previous_corners = corner_indices - 1
+        previous_corners[polygon_starts] += self.polygon_sizes
+
+        # every corner touches its vertex through two edges
+        corners = numpy.concatenate((corner_indices, corner_indices))
+        edges = numpy.concatenate((
+            self.corner_edges,
+            self.corner_edges[previous_corners]))
+
+        connecting = ~self.split_edges[edges]
+        corners = corners[connecting]
+        edges = edges[connecting]
+
+        labels = corner_indices
+        if len(corners) == 0:
+            return labels
+
+        vertices = self.corner_vertices[corners]
+        order = numpy.lexsort((edges, vertices))
+        corners = corners[order]
+        vertices = vertices[order]
+        edges = edges[order]
+
+        group_starts = numpy.flatnonzero(numpy.concatenate((
+            [True],
+            (vertices[1:] != vertices[:-1]) | (edges[1:] != edges[:-1]))))
+        group_sizes = numpy.diff(numpy.append(group_starts, len(corners)))
+
+        while True:
+            group_labels = numpy.minimum.reduceat(labels[corners], group_starts)
+
+            new_labels = labels.copy()
+            numpy.minimum.at(
+                new_labels, corners, numpy.repeat(group_labels, group_sizes))
+            new_labels = new_labels[new_labels]
+
+            if numpy.array_equal(new_labels, labels):
+                return labels
+
+            labels = new_labels
+
+    def _split_sharp_edges(self, normals: numpy.ndarray):
+        # Same result as an edge split modifier using sharp edges: Every
+        # connected component of corners around a vertex becomes its own
+        # vertex. The first component keeps the vertex index, the others
+        # get appended to the vertices
+
+        vertex_count = len(self.positions)
+        labels = self._get_corner_components()
+
+        component_labels, corner_components = numpy.unique(
+            labels, return_inverse=True)
+        component_vertices = self.corner_vertices[component_labels]
+
+        order = numpy.lexsort((component_labels, component_vertices))
+        sorted_vertices = component_vertices[order]
+        first = numpy.concatenate((
+            [True], sorted_vertices[1:] != sorted_vertices[:-1]))
+        extra = order[~first]
+
+        component_indices = numpy.empty(len(order), dtype=numpy.int64)
+        component_indices[order[first]] = sorted_vertices[first]
+        component_indices[extra] = vertex_count + numpy.arange(len(extra))
+
+        self.vertex_sources = numpy.concatenate((
+            numpy.arange(vertex_count), component_vertices[extra]))
+
+        # the normals of split vertices are averaged from their corners
+        split_vertices = numpy.zeros(vertex_count, dtype=bool)
+        split_vertices[component_vertices[extra]] = True
+        split_components = split_vertices[component_vertices]
+
+        component_normals = numpy.zeros(
+            (len(component_labels), 3), dtype=numpy.float32)
+        numpy.add.at(component_normals, corner_components, self.corner_normals)
+        component_normals /= numpy.bincount(corner_components)[:, None]
+
+        normals = normals[self.vertex_sources]
+        normals[component_indices[split_components]] = \
+            component_normals[split_components]
+
+        corner_vertices = component_indices[corner_components]
+        return corner_vertices.astype(numpy.int32), normals
+
+    def get_hash(self):
+        '''Hashes all data that the processed buffers depend on'''
+
+        if self._hash is None:
+            self._hash = self._compute_hash()
+
+        return self._hash
+
+    def get_content_key(self):
+        '''Key by which two meshes convert to identical mesh structs, apart
+        from their name'''
+
+        return (
+            self.get_hash(),
+            self.root_index,
+            self.has_vertex_colors,
+            self.force_vertex_colors,
+            self.texcoord_precision_level,
+            self.no_bounds,
+            # the material structs themselves, as pythonnet compares them
+            # by their value via Equals; hash codes alone can collide
+            tuple(self.materials)
+        )
+
+    def _compute_hash(self):
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(repr((
+            self.weight_num,
+            self.point_colors,
+            len(self.materials)
+        )).encode())
+
+        for array in (
+                self.positions,
+                self.normals,
+                self.vertex_matrix,
+                self.normal_matrix,
+                self.weight_offsets,
+                self.weight_slots,
+                self.weight_values,
+                self.corner_vertices,
+                self.corner_edges,
+                self.corner_normals,
+                self.split_edges,
+                self.uvs,
+                self.colors,
+                self.polygon_sizes,
+                self.triangle_corners,
+                self.triangle_materials):
+
+            if array is None:
+                digest.update(b"none")
+                continue
+
+            array = numpy.ascontiguousarray(array)
+            digest.update(repr((array.dtype.str, array.shape)).encode())
+            digest.update(array.data)
+
+        return digest.hexdigest()
+
+    def process(self):
+        '''Processes the arrays into the flat buffers that the mesh struct
+        gets created from'''
+
+        positions = self.positions
+        normals = self.normals
+        weights = self._get_weights()
+        colors = self._get_corner_colors()
+        corner_vertices = self.corner_vertices
+
+        if self.corner_edges is not None:
+            corner_vertices, normals = self._split_sharp_edges(normals)
+            positions = positions[self.vertex_sources]
+            if weights is not None:
+                weights = weights[self.vertex_sources]
+
+        corners, set_lengths, material_indices = self._get_corner_sets()
+
+        buffers = {
+            "positions": _to_net_space(positions, self.vertex_matrix),
+            "normals": _to_net_space(normals, self.normal_matrix),
+            "corner_vertices": corner_vertices[corners],
+            "uvs": self._get_corner_uvs()[corners],
+            "colors": colors[corners],
+            "set_lengths": set_lengths,
+            "material_indices": material_indices,
+        }
+
+        if weights is not None:
+            buffers["weights"] = weights
+
+        if self.vertex_sources is not None:
+            buffers["vertex_sources"] = self.vertex_sources
+
+        return buffers
+
+    def _create_mesh_struct(self, buffers: dict[str, numpy.ndarray]):
+        # corners store their vertex index as 16 bit; checked after processing,
+        # as splitting sharp edges may add vertices
+        vertex_count = len(buffers["positions"])
+        if vertex_count > 0xFFFF + 1:
+            raise SAIOException(
+                f"Mesh \"{self.name}\" has {vertex_count} vertices after"
+                f" processing, but at most {0xFFFF + 1} are supported!")
+
+        weights = buffers.get("weights", None)
+
+        return SAIO_NET.MESH_STRUCT.FromArrays(
+            self.name,
+            to_net_array(buffers["positions"]),
+            to_net_array(buffers["normals"]),
+            None if weights is None else to_net_array(weights),
+            self.weight_num,
+            to_net_array(buffers["corner_vertices"]),
+            to_net_array(buffers["uvs"]),
+            to_net_array(buffers["colors"]),
+            to_net_array(buffers["set_lengths"]),
+            [self.materials[i] for i in buffers["material_indices"]],
+            self.root_index,
+            self.has_vertex_colors,
+            self.force_vertex_colors,
+            self.texcoord_precision_level,
+            self.no_bounds
+        )
+
+    def convert(self, cache: MeshConversionCache | None = None):
+        '''Converts the arrays to an SAIO.NET mesh struct. The processed
+        buffers are looked up in and stored to the cache, if passed.
+
+        The mesh struct itself is always created anew, as the node structure
+        modifies it in place (e.g. when flipping vertex color channels)'''
+
+        if cache is None:
+            buffers = self.process()
+        else:
+            key = self.get_hash()
+            buffers = cache.get(key)
+            if buffers is None:
+                buffers = self.process()
+                cache.set(key, buffers)
+
+        self.vertex_sources = buffers.get("vertex_sources", None)
+        return self._create_mesh_struct(buffers)
+
+    @staticmethod
+    def convert_all(
+            mesh_arrays: list['MeshArrays'],
+            cache: MeshConversionCache | None = None):
+        '''Converts multiple meshes on a thread pool. NumPy and pythonnet
+        release the GIL while working, so the conversions run in parallel'''
+
+        if len(mesh_arrays) < 2:
+            return [arrays.convert(cache) for arrays in mesh_arrays]
+
+        worker_count = min(len(mesh_arrays), os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=worker_count) as executor:
+            return list(executor.map(
+                lambda arrays: arrays.convert(cache), mesh_arrays))
+
 
 class ModelMesh:
 
@@ -20,16 +450,24 @@ class ModelMesh:
     '''Name of the node this model is attached to. None for weighted models'''
 
     vertex_mapping: list[int] | None
+    '''Converted vertex index -> mesh vertex index. Only set when the
+    vertices got optimized or split on conversion'''
+
+    content_key: tuple | None
+    '''Identifies the converted mesh struct by content. Set by
+    evaluate_models'''
+
+    _vertex_sources: numpy.ndarray | None
 
     _depending_bones: list[str]
     _root_bone_name: str | None
     _root_bone_index: int
     _weight_num: int
+    _vertex_weights: tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]
+    '''CSR weight matrix of the evaluated mesh (offsets, groups, weights)'''
 
     _viewport_modifier_states: dict[bpy.types.Modifier, bool]
     _armature_modifier: bpy.types.ArmatureModifier
-    _edge_split_modifier: bpy.types.EdgeSplitModifier
-    _triangulate_modifier: bpy.types.TriangulateModifier
 
     _evaluated_object: bpy.types.Object
     _evaluated_mesh: bpy.types.Mesh
@@ -47,15 +485,16 @@ class ModelMesh:
         self.attached_node_name = attached_node_name
 
         self.vertex_mapping = None
+        self.content_key = None
+        self._vertex_sources = None
 
         self._depending_bones = None
         self._root_bone_name = None
         self._root_bone_index = None
         self._weight_num = None
+        self._vertex_weights = None
 
         self._armature_modifier = None
-        self._edge_split_modifier = None
-        self._triangulate_modifier = None
         self._viewport_modifier_states = {}
 
     @property
@@ -74,47 +513,52 @@ class ModelMesh:
     # Evaluation routine
 
     def _prepare_modifiers(self, apply_modifiers: bool, apply_armature: bool):
-        # Whether the model is actually weighted
+        # Only touching modifiers whose state actually has to change, as
+        # every change invalidates the depsgraph
         for modifier in self.object.modifiers:
-            self._viewport_modifier_states[modifier] = modifier.show_viewport
 
             if (self._is_weighted
                     and modifier.type == 'ARMATURE'
                     and modifier.object == self.object.parent):
                 self._armature_modifier = modifier
-                modifier.show_viewport = apply_armature
+                show_viewport = apply_armature
 
             elif not apply_modifiers:
-                modifier.show_viewport = False
-
-        # add edge split modifier
-        self._edge_split_modifier = self.object.modifiers.new(
-            "ExportEdgeSplit",
-            'EDGE_SPLIT')
+                show_viewport = False
 
-        self._edge_split_modifier.use_edge_angle = False
-        self._edge_split_modifier.use_edge_sharp = True
+            else:
+                continue
 
-        # add triangulate modifier
-        self._triangulate_modifier = self.object.modifiers.new(
-            "ExportTriangulate",
-            'TRIANGULATE')
-        self._triangulate_modifier.quad_method = 'FIXED'
-        self._triangulate_modifier.ngon_method = 'CLIP'
-        self._triangulate_modifier.min_vertices = 4
-        self._triangulate_modifier.keep_custom_normals = True
+            if modifier.show_viewport != show_viewport:
+                self._viewport_modifier_states[modifier] = \
+                    modifier.show_viewport
+                modifier.show_viewport = show_viewport
 
-    def _collect_depending_bones(self):
-        group_indices = set()
+    def _read_vertex_weights(self):
+        # One pass over all vertex group assignments, stored as a sparse
+        # CSR matrix: the entries of vertex i are in [offsets[i], offsets[i+1])
+        offsets = [0]
+        group_indices = []
+        weights = []
 
-        for vertex in self.object.data.vertices:
+        for vertex in self._evaluated_mesh.vertices:
             for group in vertex.groups:
-                if group.weight > 0:
-                    group_indices.add(group.group)
+                group_indices.append(group.group)
+                weights.append(group.weight)
+            offsets.append(len(group_indices))
+
+        self._vertex_weights = (
+            numpy.array(offsets, dtype=numpy.int64),
+            numpy.array(group_indices, dtype=numpy.int64),
+            numpy.array(weights, dtype=numpy.float32)
+        )
+
+    def _collect_depending_bones(self):
+        _, group_indices, weights = self._vertex_weights
 
         self._depending_bones = []
-        for index in group_indices:
-            bone_name = self.object.vertex_groups[index].name
+        for index in numpy.unique(group_indices[weights > 0]):
+            bone_name = self.object.vertex_groups[int(index)].name
             if (bone_name in self._name_mapping
                     and self._bones[bone_name].bone.use_deform):
                 self._depending_bones.append(bone_name)
@@ -141,7 +585,7 @@ class ModelMesh:
         self._root_bone_name = self.node_structure.root_bone_name
 
     def _eval_weight_structure(self):
-        self._collect_depending_bones()
+        self._read_vertex_weights()
         self._compute_common_root_bone_name()
 
         self._root_bone_index = self._name_mapping[self._root_bone_name]
@@ -166,12 +610,9 @@ class ModelMesh:
             self._eval_weight_structure()
 
     def _cleanup_modifiers(self):
-        self.object.modifiers.remove(self._triangulate_modifier)
-        if self._edge_split_modifier is not None:
-            self.object.modifiers.remove(self._edge_split_modifier)
-
-        for modifier in self.object.modifiers:
-            modifier.show_viewport = self._viewport_modifier_states[modifier]
+        for modifier, show_viewport in self._viewport_modifier_states.items():
+            modifier.show_viewport = show_viewport
+        self._viewport_modifier_states.clear()
 
     def get_shape_model(
             self,
@@ -195,27 +636,48 @@ class ModelMesh:
     # Conversion routine
 
     @staticmethod
-    def get_normals(mesh: bpy.types.Mesh):
-        normals = [vert.normal for vert in mesh.vertices]
+    def get_normals(mesh: bpy.types.Mesh) -> numpy.ndarray:
+        '''Returns the vertex normals as an (N, 3) array. Custom normals get
+        averaged per vertex'''
+
+        vertex_count = len(mesh.vertices)
+        normals = numpy.empty(vertex_count * 3, dtype=numpy.float32)
+        mesh.vertex_normals.foreach_get("vector", normals)
+        normals = normals.reshape(-1, 3)
+
         if not mesh.has_custom_normals:
             return normals
 
-        split_normals = [Vector() for _ in normals]
-        split_normal_count = [0] * len(normals)
+        corner_count = len(mesh.loops)
+        corner_vertices = numpy.empty(corner_count, dtype=numpy.int32)
+        mesh.loops.foreach_get("vertex_index", corner_vertices)
 
-        for loop, normal in zip(mesh.loops, mesh.corner_normals):
-            split_normals[loop.vertex_index] += normal.vector
-            split_normal_count[loop.vertex_index] += 1
+        corner_normals = numpy.empty(corner_count * 3, dtype=numpy.float32)
+        mesh.corner_normals.foreach_get("vector", corner_normals)
+        corner_normals = corner_normals.reshape(-1, 3)
 
-        for index, count in enumerate(split_normal_count):
-            if count > 0:
-                normals[index] = split_normals[index] / count
+        counts = numpy.bincount(corner_vertices, minlength=vertex_count)
+        split_normals = numpy.column_stack([
+            numpy.bincount(
+                corner_vertices,
+                weights=corner_normals[:, axis],
+                minlength=vertex_count)
+            for axis in range(3)])
+
+        used = counts > 0
+        normals[used] = split_normals[used] / counts[used, None]
 
         return normals
 
-    def _get_normals(self):
+    def _get_normals(self) -> numpy.ndarray:
         return ModelMesh.get_normals(self._evaluated_mesh)
 
+    def _get_positions(self) -> numpy.ndarray:
+        mesh = self._evaluated_mesh
+        positions = numpy.empty(len(mesh.vertices) * 3, dtype=numpy.float32)
+        mesh.vertices.foreach_get("undeformed_co", positions)
+        return positions.reshape(-1, 3)
+
     def get_matrices(self) -> tuple[Matrix, Matrix]:
         if self._is_weighted:
             target = self.node_structure.node_matrices[self._root_bone_name]
@@ -227,191 +689,167 @@ class ModelMesh:
 
         return vertex_matrix, normal_matrix
 
-    def _get_weighted_verts(self):
+    def _extract_vertices(self, output: MeshArrays):
+        output.positions = self._get_positions()
+        output.normals = self._get_normals()
 
+        if self.node_structure is None:
+            output.root_index = 0
+            return
+
+        if self._is_weighted:
+            output.root_index = self._root_bone_index
+        else:
+            output.root_index = self._name_mapping[self.attached_node_name]
+
+            # No armature = no space conversion needed, since the attaches
+            # are directly located on the objects
+            if self.node_structure.armature_object is None:
+                return
+
+        # Armature = space conversion needed, as meshes' transformation
+        # may not match that of the bones
         vertex_matrix, normal_matrix = self.get_matrices()
-        normals = self._get_normals()
+        output.vertex_matrix = numpy.array(vertex_matrix, dtype=numpy.float32)
+        output.normal_matrix = numpy.array(normal_matrix, dtype=numpy.float32)
+
+    def _extract_weights(self, output: MeshArrays):
+        if not self._is_weighted:
+            return
 
-        buffer_vertices = []
+        # vertex group index -> weight index; -1 for non-depending groups
+        group_slots = numpy.full(
+            len(self._evaluated_object.vertex_groups), -1, dtype=numpy.int64)
 
-        groups: list[tuple[bpy.types.VertexGroup, int]] = []
         for group in self._evaluated_object.vertex_groups:
-            if group.name not in self._depending_bones:
-                continue
+            if group.name in self._depending_bones:
+                group_slots[group.index] = (
+                    self._name_mapping[group.name]
+                    - self._root_bone_index)
 
-            groups.append((
-                group,
-                self._name_mapping[group.name]
-                - self._root_bone_index))
-
-        for index, vert in enumerate(self._evaluated_mesh.vertices):
-            pos = vertex_matrix @ vert.undeformed_co
-            nrm = normal_matrix @ normals[index]
-
-            wbv = SA3D_Modeling.WEIGHTED_VERTEX(
-                System.VECTOR3(pos.x, pos.z, -pos.y),
-                System.VECTOR3(nrm.x, nrm.z, -nrm.y),
-                self._weight_num)
-
-            # getting weights
-            total_weight = 0
-            for group, node_index in groups:
-                try:
-                    weight = group.weight(index)
-                except RuntimeError:
-                    continue
-                if weight > 0:
-                    total_weight += weight
-                    wbv.Weights[node_index] = weight
-
-            # normalizing
-            if total_weight == 0:
-                wbv.Weights[0] = 1
-            elif total_weight != 1:
-                for i, weight in enumerate(wbv.Weights):
-                    if weight > 0:
-                        wbv.Weights[i] /= total_weight
-
-            buffer_vertices.append(wbv)
-
-        return buffer_vertices
-
-    def _get_nonweight_verts(self):
-        vertices = []
-        normals = self._get_normals()
-
-        def add_vertex(pos, nrm):
-            vertices.append(SA3D_Modeling.WEIGHTED_VERTEX(
-                System.VECTOR3(pos.x, pos.z, -pos.y),
-                System.VECTOR3(nrm.x, nrm.z, -nrm.y)
-            ))
-
-        if self.node_structure.armature_object is None:
-            # No armature = no space conversion needed, since the attaches are
-            # directly located on the objects
-
-            for vertex, normal in zip(self._evaluated_mesh.vertices, normals):
-                pos = vertex.undeformed_co
-                add_vertex(pos, normal)
+        offsets, group_indices, weights = self._vertex_weights
 
-        else:
-            # Armature = space conversion needed, as meshes' transformation
-            # may not match that of the bones
-            vertex_matrix, normal_matrix = self.get_matrices()
+        output.weight_num = self._weight_num
+        output.weight_offsets = offsets
+        output.weight_slots = group_slots[group_indices]
+        output.weight_values = weights
 
-            for vertex, normal in zip(self._evaluated_mesh.vertices, normals):
-                pos = vertex_matrix @ vertex.undeformed_co
-                nrm = normal_matrix @ normal
-                add_vertex(pos, nrm)
+    def _extract_corners(self, output: MeshArrays):
+        mesh = self._evaluated_mesh
 
-        return vertices
+        corner_count = len(mesh.loops)
+        output.corner_vertices = numpy.empty(corner_count, dtype=numpy.int32)
+        mesh.loops.foreach_get("vertex_index", output.corner_vertices)
 
-    def _get_raw_verts(self):
-        vertices = []
-        normals = self._get_normals()
+        vertex_colors = mesh.color_attributes.active_color
+        if vertex_colors is not None:
+            colors = numpy.empty(
+                len(vertex_colors.data) * 4, dtype=numpy.float32)
+            vertex_colors.data.foreach_get("color", colors)
+            output.colors = colors.reshape(-1, 4)
+            output.point_colors = vertex_colors.domain == 'POINT'
+
+        output.uvs = numpy.zeros(corner_count * 2, dtype=numpy.float32)
+        uv_layer = mesh.uv_layers.active
+        if uv_layer is not None:
+            uv_layer.data.foreach_get("uv", output.uvs)
+        output.uvs = output.uvs.reshape(-1, 2)
 
-        for vertex, nrm in zip(self._evaluated_mesh.vertices, normals):
-            pos = vertex.undeformed_co
-            vertices.append(SA3D_Modeling.WEIGHTED_VERTEX(
-                System.VECTOR3(pos.x, pos.z, -pos.y),
-                System.VECTOR3(nrm.x, nrm.z, -nrm.y)
-            ))
+        output.polygon_sizes = numpy.empty(
+            len(mesh.polygons), dtype=numpy.int32)
+        mesh.polygons.foreach_get("loop_total", output.polygon_sizes)
 
-        return vertices
+        self._extract_triangles(output)
+        self._extract_split_edges(output)
 
-    def _get_polygon_data(self, texlist_manager: TexlistManager):
-        from . import o_material
+    def _extract_triangles(self, output: MeshArrays):
+        # The loop triangles are maintained by blender, so there is no need
+        # to triangulate the mesh with a modifier. Their corners reference
+        # the polygon loops, and with that all corner data.
+        triangles = self._evaluated_mesh.loop_triangles
 
-        corners: list[list] = []
-        materials = []
+        output.triangle_corners = numpy.empty(
+            len(triangles) * 3, dtype=numpy.int32)
+        triangles.foreach_get("loops", output.triangle_corners)
 
-        for m in self._evaluated_mesh.materials:
-            corners.append([])
-            materials.append(
-                o_material.convert_material_to_struct(m, texlist_manager))
+        output.triangle_materials = numpy.empty(
+            len(triangles), dtype=numpy.int32)
+        triangles.foreach_get("material_index", output.triangle_materials)
 
-        # if no materials, add default material and corner set
-        if len(materials) == 0:
-            corners.append([])
-            materials.append(o_material.default_material_struct())
+    def _extract_split_edges(self, output: MeshArrays):
+        mesh = self._evaluated_mesh
 
-        # Color obtainer
+        # corners get disconnected along sharp edges and flat faces
+        split_edges = numpy.empty(len(mesh.edges), dtype=bool)
+        mesh.edges.foreach_get("use_edge_sharp", split_edges)
 
-        vertex_colors = self._evaluated_mesh.color_attributes.active_color
-        if vertex_colors is not None:
-            if vertex_colors.domain == 'POINT':
-                def get_color(loop, vertex): # pylint: disable=unused-argument
-                    return linear_to_srgb(vertex_colors.data[vertex].color)
-            else:
-                def get_color(loop, vertex): # pylint: disable=unused-argument
-                    return linear_to_srgb(vertex_colors.data[loop].color)
-        else:
-            def get_color(loop, vertex): # pylint: disable=unused-argument
-                return (1.0, 1.0, 1.0, 1.0)
+        polygon_smooth = numpy.empty(len(mesh.polygons), dtype=bool)
+        mesh.polygons.foreach_get("use_smooth", polygon_smooth)
 
-        # UV Obtainer
+        if not split_edges.any() and polygon_smooth.all():
+            return
 
-        uv_layer = self._evaluated_mesh.uv_layers.active
-        if uv_layer is not None:
-            def get_uv(x):
-                return uv_layer.data[x].uv
-        else:
-            def get_uv(x): # pylint: disable=unused-argument
-                return (0, 0)
+        corner_count = len(mesh.loops)
+        output.corner_edges = numpy.empty(corner_count, dtype=numpy.int32)
+        mesh.loops.foreach_get("edge_index", output.corner_edges)
 
-        # Collecting the data
+        flat_corners = ~numpy.repeat(polygon_smooth, output.polygon_sizes)
+        split_edges[output.corner_edges[flat_corners]] = True
+        output.split_edges = split_edges
 
-        for polygon in self._evaluated_mesh.polygons:
-            cornerset = corners[polygon.material_index]
-            for loop in polygon.loop_indices:
-                vert = self._evaluated_mesh.loops[loop].vertex_index
-                vcol = get_color(loop, vert)
-                uv = get_uv(loop)
+        output.corner_normals = numpy.empty(
+            corner_count * 3, dtype=numpy.float32)
+        mesh.corner_normals.foreach_get("vector", output.corner_normals)
+        output.corner_normals = output.corner_normals.reshape(-1, 3)
 
-                cornerset.append(SA3D_Modeling.BUFFER_CORNER(
-                    vert,
-                    SA3D_Modeling.COLOR(vcol[0], vcol[1], vcol[2], vcol[3]),
-                    System.VECTOR2(uv[0], 1 - uv[1])
-                ))
+    def _extract_materials(
+            self,
+            output: MeshArrays,
+            texlist_manager: TexlistManager):
 
-        result_materials = []
-        result_corners = []
+        from . import o_material
 
-        for i, cornerset in enumerate(corners):
-            if len(cornerset) > 0:
-                result_materials.append(materials[i])
-                result_corners.append(cornerset)
+        output.materials = [
+            o_material.convert_material_to_struct(m, texlist_manager)
+            for m in self._evaluated_mesh.materials]
 
-        if len(result_corners) == 0:
-            raise SAIOException("Empty mesh!")
+        # if no materials, add default material
+        if len(output.materials) == 0:
+            output.materials.append(o_material.default_material_struct())
 
-        return result_corners, result_materials
+    def extract_arrays(self, texlist_manager: TexlistManager):
+        '''Reads all data required for conversion from the evaluated mesh'''
 
-    def convert_to_weighted_buffer(self, texlist_manager):
+        mesh_properties = self.object.data.saio_mesh
 
-        if self.node_structure is None:
-            root_index = 0
-            vertices = self._get_raw_verts()
-        elif self._is_weighted:
-            root_index = self._root_bone_index
-            vertices = self._get_weighted_verts()
-        else:
-            root_index = self._name_mapping[self.attached_node_name]
-            vertices = self._get_nonweight_verts()
+        output = MeshArrays(self._evaluated_mesh.name)
+        output.has_vertex_colors = len(
+            self._evaluated_mesh.color_attributes) > 0
+        output.force_vertex_colors = mesh_properties.force_vertex_colors
+        output.texcoord_precision_level = \
+            mesh_properties.texcoord_precision_level
+        output.no_bounds = mesh_properties.no_bounds
 
-        corners, materials = self._get_polygon_data(texlist_manager)
+        self._extract_vertices(output)
+        self._extract_weights(output)
+        self._extract_corners(output)
+        self._extract_materials(output, texlist_manager)
 
-        return SAIO_NET.MESH_STRUCT(
-            self._evaluated_mesh.name,
-            vertices,
-            corners,
-            materials,
-            root_index,
-            len(self._evaluated_mesh.color_attributes) > 0,
-            self.object.data.saio_mesh.force_vertex_colors,
-            self.object.data.saio_mesh.texcoord_precision_level,
-            self.object.data.saio_mesh.no_bounds
-        )
+        return output
+
+    def set_vertex_mapping(self, mapping):
+        '''Sets the vertex mapping from the converted vertex indices, taking
+        vertices that got split on conversion into account'''
+
+        if mapping is not None:
+            mapping = list(mapping)
+            if self._vertex_sources is not None:
+                mapping = self._vertex_sources[mapping].tolist()
+
+        elif self._vertex_sources is not None:
+            mapping = self._vertex_sources.tolist()
+
+        self.vertex_mapping = mapping
 
     @staticmethod
     def evaluate_models(
@@ -429,16 +867,23 @@ class ModelMesh:
 
         depsgraph = context.evaluated_depsgraph_get()
 
-        mesh_structs = []
+        # Reading data from blender has to happen on the main thread,
+        # everything after that can be converted in parallel
+        mesh_arrays = []
         for mesh in meshes:
             mesh._evaluate(depsgraph) # pylint: disable=protected-access
 
             if convert:
-                weighted_buffer = mesh.convert_to_weighted_buffer(
-                    texlist_manager)
-                mesh_structs.append(weighted_buffer)
+                mesh_arrays.append(mesh.extract_arrays(texlist_manager))
 
         for mesh in meshes:
             mesh._cleanup_modifiers() # pylint: disable=protected-access
 
+        mesh_structs = MeshArrays.convert_all(
+            mesh_arrays, get_mesh_cache(context.scene))
+
+        for mesh, arrays in zip(meshes, mesh_arrays):
+            mesh._vertex_sources = arrays.vertex_sources # pylint: disable=protected-access
+            mesh.content_key = arrays.get_content_key()
+
         return mesh_structs
@@ -0,0 +1,217 @@
+import os
+import threading
+from collections import OrderedDict
+
+import bpy
+import numpy
+
+from ..utility.general import get_cache_directory
+
+
+class MeshConversionCache:
+    '''Stores processed mesh buffers by the hash of the mesh data they were
+    created from, so that unchanged meshes dont get converted again on
+    subsequent exports. Least recently used entries get evicted once the
+    memory budget is exceeded, and entries can optionally be kept on disk,
+    where the least recently used files get removed once the disk budget is
+    exceeded'''
+
+    max_bytes: int
+    '''Memory budget of the buffers held in memory'''
+
+    max_disk_bytes: int
+    '''Budget of the .npz files in the cache directory'''
+
+    _directory: str | None
+    _entries: OrderedDict[str, dict[str, numpy.ndarray]]
+    _size: int
+    _lock: threading.Lock
+    _disk_size: int | None
+    _disk_lock: threading.Lock
+
+    def __init__(
+            self,
+            max_bytes: int = 1 << 30,
+            max_disk_bytes: int = 1 << 31):
+
+        self.max_bytes = max_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self._directory = None
+
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self._disk_size = None
+        self._disk_lock = threading.Lock()
+
+    @property
+    def directory(self):
+        '''Directory to store entries in as .npz files. None to keep them in
+        memory only'''
+        return self._directory
+
+    @directory.setter
+    def directory(self, value: str | None):
+        with self._disk_lock:
+            if value != self._directory:
+                self._directory = value
+                self._disk_size = None
+
+    @staticmethod
+    def _get_size(buffers: dict[str, numpy.ndarray]):
+        return sum(buffer.nbytes for buffer in buffers.values())
+
+    def _get_filepath(self, key: str):
+        return os.path.join(self.directory, key + ".npz")
+
+    def _store(self, key: str, buffers: dict[str, numpy.ndarray]):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return
+
+            self._entries[key] = buffers
+            self._size += self._get_size(buffers)
+
+            while self._size > self.max_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= self._get_size(evicted)
+
+    def _load_file(self, key: str):
+        if self.directory is None:
+            return None
+
+        filepath = self._get_filepath(key)
+        if not os.path.isfile(filepath):
+            return None
+
+        try:
+            with numpy.load(filepath) as data:
+                buffers = {name: data[name] for name in data.files}
+        except (OSError, ValueError):
+            # corrupted or incomplete entry; gets overwritten on the next set
+            return None
+
+        try:
+            # marks the file as recently used for pruning
+            os.utime(filepath)
+        except OSError:
+            pass
+
+        return buffers
+
+    def _get_disk_files(self):
+        files = []
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if not entry.name.endswith(".npz") or not entry.is_file():
+                    continue
+
+                stat = entry.stat()
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+
+        return files
+
+    def _prune_files(self, keep: str):
+        files = sorted(self._get_disk_files())
+        size = sum(file[1] for file in files)
+
+        for _, file_size, filepath in files:
+            if size <= self.max_disk_bytes:
+                break
+
+            if filepath == keep:
+                continue
+
+            try:
+                os.remove(filepath)
+            except OSError:
+                continue
+
+            size -= file_size
+
+        return size
+
+    def _add_disk_size(self, filepath: str, file_size: int):
+        with self._disk_lock:
+            if self._disk_size is None:
+                self._disk_size = sum(
+                    file[1] for file in self._get_disk_files())
+            else:
+                self._disk_size += file_size
+
+            if self._disk_size > self.max_disk_bytes:
+                self._disk_size = self._prune_files(filepath)
+
+    def _save_file(self, key: str, buffers: dict[str, numpy.ndarray]):
+        if self.directory is None:
+            return
+
+        os.makedirs(self.directory, exist_ok=True)
+        filepath = self._get_filepath(key)
+
+        # writing to a temporary file first, so that an interrupted export
+        # cant leave a half written entry behind
+        temp_filepath = f"{filepath}.{threading.get_ident()}.tmp"
+        with open(temp_filepath, "wb") as file:
+            numpy.savez(file, **buffers)
+        os.replace(temp_filepath, filepath)
+
+        self._add_disk_size(filepath, os.path.getsize(filepath))
+
+    def get(self, key: str):
+        '''Returns the buffers stored for the key, or None if there are none'''
+
+        with self._lock:
+            buffers = self._entries.get(key)
+            if buffers is not None:
+                self._entries.move_to_end(key)
+                return buffers
+
+        buffers = self._load_file(key)
+        if buffers is not None:
+            self._store(key, buffers)
+
+        return buffers
+
+    def set(self, key: str, buffers: dict[str, numpy.ndarray]):
+        '''Stores buffers for the key'''
+
+        self._store(key, buffers)
+        self._save_file(key, buffers)
+
+    def clear(self):
+        '''Removes all entries held in memory'''
+
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+
+CACHE_FORMAT_VERSION = 1
+'''Version of the buffers stored on disk. Has to be increased whenever the
+processed buffers change (names, dtypes, processing), so that files written
+by older versions of the addon dont get loaded'''
+
+_MESH_CACHE = MeshConversionCache()
+
+
+def get_mesh_cache(scene: bpy.types.Scene):
+    '''Returns the mesh conversion cache, with the on-disk store set up
+    according to the scene settings'''
+
+    directory = None
+    if scene.saio_scene.mesh_cache_on_disk:
+        directory = get_cache_directory("meshes")
+
+    if directory is not None:
+        directory = os.path.join(directory, f"v{CACHE_FORMAT_VERSION}")
+
+    _MESH_CACHE.directory = directory
+
+    return _MESH_CACHE
+
+
+def clear_mesh_cache():
+    '''Removes all mesh conversions held in memory'''
+    _MESH_CACHE.clear()
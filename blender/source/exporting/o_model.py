@@ -137,8 +137,7 @@ class ModelEvaluator:
             vertex_mapping)
 
         for map, modelmesh in zip(vertex_mapping, self._output.meshes.values()):
-            if map is not None:
-                modelmesh.vertex_mapping = list(map)
+            modelmesh.set_vertex_mapping(map)
 
     def save_debug(self, filepath: str):
         SAIO_NET.DEBUG_MODEL(
@@ -1,6 +1,12 @@
+import os
+import bpy
+import numpy
+
+from .o_texture_cache import TextureEncodeCache, get_texture_cache
 from ..register.property_groups.texture_properties import SAIO_TextureList
 from ..register.property_groups.texturename_properties import SAIO_TextureNameList
 from ..dotnet import System, SA3D_Common, SA3D_Texturing, SA3D_Archival, SAIO_NET
+from ..dotnet.buffers import to_net_array, to_numpy_array
 from ..exceptions import SAIOException
 
 
@@ -32,8 +38,40 @@ def create_texnames_from_textures(
     return SA3D_Texturing.TEXTURE_NAME_LIST(name, tex_array)
 
 
-def create_texture_set(texture_list: SAIO_TextureList):
-    sa3d_textures = []
+def get_image_pixels(image: bpy.types.Image):
+    '''Reads the pixels of an image into a flat float32 RGBA array'''
+
+    pixels = numpy.empty(len(image.pixels), dtype=numpy.float32)
+    image.pixels.foreach_get(pixels)
+
+    channels = image.channels
+    if channels == 4:
+        return pixels
+
+    pixels = pixels.reshape(-1, channels)
+    result = numpy.ones((len(pixels), 4), dtype=numpy.float32)
+    if channels < 3:
+        result[:, :3] = pixels[:, :1]
+    else:
+        result[:, :3] = pixels[:, :3]
+
+    if channels == 2:
+        result[:, 3] = pixels[:, 1]
+
+    return result.ravel()
+
+
+def _create_textures(
+        texture_list: SAIO_TextureList,
+        cache: TextureEncodeCache):
+    '''Creates the .NET textures of a texture list and returns them together
+    with the cache keys of their pixel data'''
+
+    entries = []
+    keys = []
+    formats = []
+    pixel_data = []
+
     for texture in texture_list:
 
         is_index4 = None
@@ -43,33 +81,62 @@ def create_texture_set(texture_list: SAIO_TextureList):
             is_index4 = False
 
         if texture.image is None or not texture.image.has_data:
-            sa3d_texture = SAIO_NET.TEXTURE.Create(
-                texture.name.lower(),
-                texture.global_index,
-                2,
-                2,
-                is_index4,
-                [255, 255, 255, 255,
-                 255, 255, 255, 255,
-                 255, 255, 255, 255,
-                 255, 255, 255, 255]
-            )
+            pixels = numpy.ones(2 * 2 * 4, dtype=numpy.float32)
+            width = height = 2
         else:
-            sa3d_texture = SAIO_NET.TEXTURE.Create(
-                texture.name.lower(),
-                texture.global_index,
-                texture.image.size[0],
-                texture.image.size[1],
-                is_index4,
-                texture.image.pixels
-            )
+            pixels = get_image_pixels(texture.image)
+            width, height = texture.image.size
+
+        key = (
+            "TEXTURE",
+            texture.texture_type,
+            width,
+            height,
+            cache.hash_pixels(pixels)
+        )
+
+        entries.append(texture)
+        keys.append(key)
+        formats.append((is_index4, width, height))
+
+        data = cache.get(key)
+        if data is None:
+            # passing the address of the pixel buffer, which stays alive
+            # until the call returns
+            data = SAIO_NET.TEXTURE.CreatePixelData(
+                width, height, is_index4, pixels.ctypes.data)
+
+            # stored as a copy on the python side, so that the cache never
+            # holds on to .NET objects
+            data = to_numpy_array(data, numpy.uint8)
+            cache.set(key, data)
+
+        pixel_data.append(data)
+
+    # the textures themselves are created anew on every call, as they are
+    # mutable and handed to the caller
+    textures = []
+    for texture, data, (is_index4, width, height) in zip(
+            entries, pixel_data, formats):
+
+        sa3d_texture = SAIO_NET.TEXTURE.FromPixelData(
+            texture.name.lower(),
+            texture.global_index,
+            width,
+            height,
+            is_index4,
+            to_net_array(data))
 
         sa3d_texture.OverrideWidth = texture.override_width
         sa3d_texture.OverrideHeight = texture.override_height
+        textures.append(sa3d_texture)
 
-        sa3d_textures.append(sa3d_texture)
+    return textures, keys
 
-    return SA3D_Texturing.TEXTURE_SET(sa3d_textures)
+
+def create_texture_set(texture_list: SAIO_TextureList):
+    textures, _ = _create_textures(texture_list, get_texture_cache())
+    return SA3D_Texturing.TEXTURE_SET(textures)
 
 def encode_texture_archive(
         texture_set,
@@ -112,7 +179,7 @@ def encode_texture_archive(
 
     return archive
 
-def save_texture_archive(
+def _write_texture_archive_bytes(
         texture_set,
         filepath: str,
         archive_type: str,
@@ -124,4 +191,56 @@ def save_texture_archive(
     if compress:
         file_data = SA3D_Archival.PRS.CompressPRS(file_data)
 
+    return file_data
+
+def save_texture_archive(
+        texture_set,
+        filepath: str,
+        archive_type: str,
+        compress: bool):
+
+    file_data = _write_texture_archive_bytes(
+        texture_set, filepath, archive_type, compress)
+
     System.FILE.WriteAllBytes(filepath, file_data)
+
+def export_texture_archive(
+        texture_list: SAIO_TextureList,
+        filepath: str,
+        archive_type: str,
+        compress: bool):
+    '''Saves a texture list as a texture archive. Textures and archives that
+    are unchanged since a previous export are taken from the texture cache
+    instead of being converted and encoded again'''
+
+    cache = get_texture_cache()
+    textures, keys = _create_textures(texture_list, cache)
+
+    # PAK archives store a path derived from where they get saved to
+    archive_path = None
+    if archive_type == "PAK":
+        archive_path = os.path.normpath(filepath)
+
+    entry_keys = tuple(
+        key + (
+            texture.name.lower(),
+            texture.global_index,
+            texture.override_width,
+            texture.override_height)
+        for key, texture in zip(keys, texture_list))
+
+    archive_key = ("ARCHIVE", archive_type, compress, archive_path, entry_keys)
+    file_data = cache.get(archive_key)
+
+    if file_data is None:
+        file_data = to_numpy_array(
+            _write_texture_archive_bytes(
+                SA3D_Texturing.TEXTURE_SET(textures),
+                filepath,
+                archive_type,
+                compress),
+            numpy.uint8)
+
+        cache.set(archive_key, file_data)
+
+    file_data.tofile(filepath)
@@ -0,0 +1,77 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy
+
+
+class TextureEncodeCache:
+    '''Stores the pixel data converted from texture list entries and the
+    archives encoded from them, keyed by what they were created from, so
+    that unchanged textures dont get converted and encoded again on
+    subsequent exports. Least recently used entries get evicted once the
+    memory budget is exceeded.
+
+    Only numpy byte arrays are held, never .NET objects, so that entries
+    are immutable and dont depend on the .NET runtime being loaded'''
+
+    max_bytes: int
+    '''Memory budget of the pixel data and archives held'''
+
+    _entries: OrderedDict[tuple, numpy.ndarray]
+    _size: int
+    _lock: threading.Lock
+
+    def __init__(self, max_bytes: int = 1 << 29):
+        self.max_bytes = max_bytes
+
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def hash_pixels(pixels: numpy.ndarray):
+        '''Returns a hash of an images pixel buffer'''
+        return hashlib.blake2b(pixels.tobytes(), digest_size=16).hexdigest()
+
+    def get(self, key: tuple):
+        '''Returns the data stored for the key, or None if there is none'''
+
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+
+            return data
+
+    def set(self, key: tuple, data: numpy.ndarray):
+        '''Stores data for the key. The array must not be modified afterwards'''
+
+        data.flags.writeable = False
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= previous.nbytes
+
+            self._entries[key] = data
+            self._size += data.nbytes
+
+            while self._size > self.max_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= evicted.nbytes
+
+    def clear(self):
+        '''Removes all entries'''
+
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+
+_TEXTURE_CACHE = TextureEncodeCache()
+
+
+def get_texture_cache():
+    '''Returns the texture encode cache shared across exports'''
+    return _TEXTURE_CACHE
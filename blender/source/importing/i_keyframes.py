@@ -1,11 +1,18 @@
+import hashlib
+
 import bpy
+import numpy
 from mathutils import Vector, Matrix, Euler
 
 from . import i_matrix
 
-from ..dotnet import SA3D_Modeling
+from ..dotnet import SA3D_Modeling, SAIO_NET
+from ..dotnet.buffers import to_numpy_array
 from ..exceptions import SAIOException
 
+_SHAPE_TOLERANCE = 0.01
+'''Maximum distance between vertices of shape keys considered identical'''
+
 
 class TransformKeyframeProcessor:
 
@@ -339,10 +346,14 @@ class ShapeKeyframeProcessor:
     shape_mapping: dict[any, bpy.types.ShapeKey]
     '''Mapping .NET vector arrays to shape keys for reuse'''
 
+    _shape_luts: dict[int, dict[bytes, list[tuple[bpy.types.ShapeKey, numpy.ndarray]]]]
+    '''[compared vertex count][coordinate hash] = existing shape keys'''
+
     def __init__(self, obj: bpy.types.Object, optimize: bool):
         self._object = obj
         self._optimize = optimize
         self.shape_mapping = {}
+        self._shape_luts = {}
 
         if self._object.type != "MESH":
             raise SAIOException("Object doesnt support shape motions!")
@@ -358,23 +369,61 @@ class ShapeKeyframeProcessor:
         if keyframe_set.Vertex.Count == 0:
             raise SAIOException("Motion import failure!")
 
-    def _find_matching_shapekey(self, verts: list[Vector]):
+    @staticmethod
+    def _hash_coordinates(coordinates: numpy.ndarray):
+        # coordinates within the same grid cell hash equally. Near identical
+        # coordinates on different sides of a cell border are missed, which
+        # only results in an extra shape key
+        quantized = numpy.round(coordinates / _SHAPE_TOLERANCE).astype(numpy.int64)
+        return hashlib.blake2b(quantized.tobytes(), digest_size=16).digest()
+
+    @staticmethod
+    def _read_coordinates(shape_key: bpy.types.ShapeKey):
+        coordinates = numpy.empty(len(shape_key.data) * 3, dtype=numpy.float32)
+        shape_key.data.foreach_get("co", coordinates)
+        return coordinates.reshape(-1, 3)
+
+    def _get_shape_lut(self, vert_count: int):
+        if vert_count in self._shape_luts:
+            return self._shape_luts[vert_count]
+
+        shape_lut = {}
         for shape_key in self._key.key_blocks:
-            if (shape_key == self._key.reference_key
-                    or shape_key in self.shape_mapping.values()):
+            if shape_key == self._key.reference_key:
                 continue
 
-            found = True
-            for vert, svert in zip(verts, shape_key.data):
-                if (vert - svert.co).length > 0.01:
-                    found = False
-                    break
+            coordinates = self._read_coordinates(shape_key)[:vert_count]
+            shape_lut.setdefault(
+                self._hash_coordinates(coordinates), []).append(
+                    (shape_key, coordinates))
+
+        self._shape_luts[vert_count] = shape_lut
+        return shape_lut
+
+    def _find_matching_shapekey(self, coordinates: numpy.ndarray):
+        shape_lut = self._get_shape_lut(len(coordinates))
+        candidates = shape_lut.get(self._hash_coordinates(coordinates), [])
 
-            if found:
+        for shape_key, shape_coordinates in candidates:
+            if shape_key in self.shape_mapping.values():
+                continue
+
+            distances = numpy.linalg.norm(
+                coordinates - shape_coordinates, axis=1)
+            if numpy.all(distances <= _SHAPE_TOLERANCE):
                 return shape_key
 
         return None
 
+    def _get_coordinates(self, vectors, vert_count: int):
+        coordinates = to_numpy_array(
+            SAIO_NET.MODEL.GetVectorArray(vectors), numpy.float32)
+
+        # (x, y, z) -> (x, -z, y)
+        coordinates = coordinates.reshape(-1, 3)[:vert_count, (0, 2, 1)]
+        coordinates[:, 1] *= -1
+        return coordinates
+
     def _get_shapekey(
             self,
             vectors) -> bpy.types.ShapeKey:
@@ -382,8 +431,6 @@ class ShapeKeyframeProcessor:
         if vectors in self.shape_mapping:
             return self.shape_mapping[vectors]
 
-        verts = []
-
         if vectors.Length > len(self._object.data.vertices):
             print(
                 f"Warning: {self._object.name} has"
@@ -394,22 +441,23 @@ class ShapeKeyframeProcessor:
                 " more vertices than shape anim!")
 
         vert_count = min(vectors.Length, len(self._object.data.vertices))
-        for i in range(vert_count):
-            co = vectors[i]
-            verts.append(Vector((co.X, -co.Z, co.Y)))
+        coordinates = self._get_coordinates(vectors, vert_count)
 
         shape_key = None
 
         if self._optimize:
-            shape_key = self._find_matching_shapekey(verts)
+            shape_key = self._find_matching_shapekey(coordinates)
 
         if shape_key is None:
             shape_key = self._object.shape_key_add(
                 name=vectors.Label, from_mix=False)
 
-            for vert, svert in zip(verts, shape_key.data):
-                svert.co = vert
+            shape_coordinates = coordinates
+            if vert_count < len(shape_key.data):
+                shape_coordinates = self._read_coordinates(shape_key)
+                shape_coordinates[:vert_count] = coordinates
 
+            shape_key.data.foreach_set("co", shape_coordinates.ravel())
             shape_key.value = 0
 
         self.shape_mapping[vectors] = shape_key
@@ -36,6 +36,7 @@ class LandtableProcessor:
 
     _animation_collection: bpy.types.Collection | None
     _motion_lut: dict[any, bpy.types.Action]
+    _material_lut: dict[tuple, bpy.types.Material]
 
     _meshes: list[MeshData]
 
@@ -50,7 +51,8 @@ class LandtableProcessor:
             ensure_anim_order: bool,
             rotation_mode: bool,
             quaternion_threshold: bool,
-            short_rot: bool):
+            short_rot: bool,
+            material_lut: dict[tuple, bpy.types.Material] | None = None):
 
         self._context = context
         self._optimize = optimize
@@ -67,6 +69,11 @@ class LandtableProcessor:
 
         self._motion_lut = dict()
 
+        if material_lut is None:
+            self._material_lut = dict()
+        else:
+            self._material_lut = material_lut
+
     def _get_string(self, value) -> str:
         if value is None:
             return ""
@@ -127,7 +134,8 @@ class LandtableProcessor:
             self._context,
             self._import_data.Attaches,
             self._name,
-            auto_normals=self._auto_normals)
+            auto_normals=self._auto_normals,
+            material_lut=self._material_lut)
 
     def _setup_object(self, landentry, index):
         from . import i_matrix
@@ -194,7 +202,8 @@ class LandtableProcessor:
             self._auto_normals,
             self._anim_all_weighted_meshes,
             self._merge_anim_meshes,
-            self._ensure_anim_order
+            self._ensure_anim_order,
+            self._material_lut
         )
 
         le_prop = obj.saio_land_entry
@@ -266,7 +275,8 @@ class LandtableProcessor:
             ensure_anim_order: bool,
             rotation_mode: bool,
             quaternion_threshold: bool,
-            short_rot: bool):
+            short_rot: bool,
+            material_lut: dict[tuple, bpy.types.Material] | None = None):
 
         processor = LandtableProcessor(
             context,
@@ -278,6 +288,7 @@ class LandtableProcessor:
             ensure_anim_order,
             rotation_mode,
             quaternion_threshold,
-            short_rot)
+            short_rot,
+            material_lut)
 
         processor.process(import_data, name)
@@ -1,127 +1,151 @@
 import bpy
-from mathutils import Vector
+import numpy
 
 from . import i_enum
 
 from ..utility import material_setup
 from ..register.property_groups.material_properties import SAIO_Material
-from ..utility.color_utils import srgb_to_linear
+from ..utility.color_utils import srgb_to_linear_array
+from ..dotnet import SAIO_NET
+from ..dotnet.buffers import to_numpy_array
 
 
 class MeshData:
 
     mesh: bpy.types.Mesh
 
-    weights: list[list[tuple[int, float]]]
-    '''[group index][x] = (vertex index, weight)'''
+    weights: numpy.ndarray | None
+    '''Dense weights; [vertex index, group index] = weight. None if the mesh
+    is not weighted'''
 
     node_indices: list[int]
 
     def __init__(self, weight_group_num: int, node_indices: list[int]):
         self.mesh = None
-        self.weights = []
-        for _ in range(weight_group_num):
-            self.weights.append([])
+        self.weights = None
+        if weight_group_num > 0:
+            self.weights = numpy.zeros(
+                (0, weight_group_num), dtype=numpy.float32)
         self.node_indices = node_indices
 
     @property
     def is_weighted(self):
-        return len(self.weights) > 0
+        return self.weights is not None
 
 
 class MeshProcessor:
 
     _auto_normals: bool
 
-    material_lut: dict[any, bpy.types.Material]
+    material_lut: dict[tuple, bpy.types.Material]
+    '''Materials by their property values. Can be shared between processors
+    to reuse materials across multiple imported files'''
+    _new_materials: list[bpy.types.Material]
 
     weighted_buffer: any
     name: str
     mat_name: str
 
-    vertices: list[Vector]
-    normals: list[Vector]
-    polygons: list[tuple[int, int, int]]
+    vertices: numpy.ndarray
+    normals: numpy.ndarray
+    corners: numpy.ndarray
+    '''Vertex index of every triangle corner'''
     materials: list[bpy.types.Material]
     poly_material_lengths: list[int]
-    colors: list[tuple[float, float, float, float]]
-    uvs: list[tuple[float, float]]
+    colors: numpy.ndarray
+    uvs: numpy.ndarray
     import_normals: bool
 
     output: MeshData
 
     def __init__(
             self,
-            auto_normals: bool):
+            auto_normals: bool,
+            material_lut: dict[tuple, bpy.types.Material] | None = None):
 
         self._auto_normals = auto_normals
 
-        self.material_lut = {}
+        if material_lut is None:
+            self.material_lut = {}
+        else:
+            self.material_lut = material_lut
+        self._new_materials = []
 
-        self.vertices = []
-        self.normals = []
-        self.polygons = []
+        self.vertices = None
+        self.normals = None
+        self.corners = None
         self.materials = []
         self.poly_material_lengths = []
-        self.colors = []
-        self.uvs = []
+        self.colors = None
+        self.uvs = None
 
         self.name = None
         self.output = None
 
     #########################################################
 
-    def _to_color(self, color):
+    @staticmethod
+    def _to_color(color):
         return (color.RedF, color.GreenF, color.BlueF, color.AlphaF)
 
-    def _net_to_bpy_material(self, material, name: str):
+    @staticmethod
+    def _get_material_properties(material):
+        to_color = MeshProcessor._to_color
+
+        return {
+            "diffuse": to_color(material.Diffuse),
+            "specular": to_color(material.Specular),
+            "specular_exponent": int(material.SpecularExponent),
+            "ambient": to_color(material.Ambient),
+
+            "texture_id": material.TextureIndex,
+            "texture_filtering": i_enum.from_filter_mode(material.TextureFiltering),
+            "mipmap_distance_multiplier": material.MipmapDistanceMultiplier,
+            "source_alpha": i_enum.from_blend_mode(material.SourceBlendMode),
+            "destination_alpha": i_enum.from_blend_mode(material.DestinationBlendmode),
+
+            "anisotropic_filtering": material.AnisotropicFiltering,
+            "use_alpha": material.UseAlpha,
+            "double_sided": not material.BackfaceCulling,
+            "no_alpha_test": material.NoAlphaTest,
+            "flat_shading": material.Flat,
+            "ignore_ambient": material.NoAmbient,
+            "ignore_diffuse": material.NoLighting,
+            "ignore_specular": material.NoSpecular,
+            "use_texture": material.UseTexture,
+            "use_environment": material.NormalMapping,
+            "clamp_u": material.ClampU,
+            "mirror_u": material.MirrorU,
+            "clamp_v": material.ClampV,
+            "mirror_v": material.MirrorV,
+
+            "shadow_stencil": material.GCShadowStencil,
+            "texgen_coord_id": i_enum.from_tex_coord_id(material.GCTexCoordID),
+            "texgen_type": i_enum.from_tex_gen_type(material.GCTexCoordType),
+            "texgen_source": i_enum.from_tex_gen_source(material.GCTexCoordSource),
+            "texgen_matrix_id": i_enum.from_tex_gen_matrix(material.GCMatrixID),
+        }
+
+    @staticmethod
+    def _create_bpy_material(properties: dict[str, any], name: str):
         bpy_material = bpy.data.materials.new(name)
         props: SAIO_Material = bpy_material.saio_material
 
-        props.diffuse = self._to_color(material.Diffuse)
-        props.specular = self._to_color(material.Specular)
-        props.specular_exponent = int(material.SpecularExponent)
-        props.ambient = self._to_color(material.Ambient)
-
-        props.texture_id = material.TextureIndex
-        props.texture_filtering = i_enum.from_filter_mode(material.TextureFiltering)
-        props.mipmap_distance_multiplier = material.MipmapDistanceMultiplier
-        props.source_alpha = i_enum.from_blend_mode(material.SourceBlendMode)
-        props.destination_alpha = i_enum.from_blend_mode(material.DestinationBlendmode)
-
-        props.anisotropic_filtering = material.AnisotropicFiltering
-        props.use_alpha = material.UseAlpha
-        props.double_sided = not material.BackfaceCulling
-        props.no_alpha_test = material.NoAlphaTest
-        props.flat_shading = material.Flat
-        props.ignore_ambient = material.NoAmbient
-        props.ignore_diffuse = material.NoLighting
-        props.ignore_specular = material.NoSpecular
-        props.use_texture = material.UseTexture
-        props.use_environment = material.NormalMapping
-        props.clamp_u = material.ClampU
-        props.mirror_u = material.MirrorU
-        props.clamp_v = material.ClampV
-        props.mirror_v = material.MirrorV
-
-        props.shadow_stencil = material.GCShadowStencil
-        props.texgen_coord_id = i_enum.from_tex_coord_id(material.GCTexCoordID)
-        props.texgen_type = i_enum.from_tex_gen_type(material.GCTexCoordType)
-        props.texgen_source = i_enum.from_tex_gen_source(material.GCTexCoordSource)
-        props.texgen_matrix_id = i_enum.from_tex_gen_matrix(material.GCMatrixID)
+        for key, value in properties.items():
+            setattr(props, key, value)
 
         return bpy_material
 
     #########################################################
 
     def _setup_buffers(self):
-        self.vertices.clear()
-        self.normals.clear()
-        self.polygons.clear()
+        self.vertices = None
+        self.normals = None
+        self.corners = None
         self.materials.clear()
         self.poly_material_lengths.clear()
-        self.colors.clear()
-        self.uvs.clear()
+        self.colors = None
+        self.uvs = None
 
     def _setup_output(self):
         weight_group_num = 0
@@ -138,80 +162,84 @@ class MeshProcessor:
 
     #########################################################
 
-    def _process_vertices(self):
-        for index, vert in enumerate(self.weighted_buffer.Vertices):
-            pos = vert.Position
-            self.vertices.append(Vector((pos.X, -pos.Z, pos.Y)))
+    @staticmethod
+    def _to_blender_space(vectors: numpy.ndarray):
+        # (x, y, z) -> (x, -z, y)
+        result = vectors.reshape(-1, 3)[:, (0, 2, 1)]
+        result[:, 1] *= -1
+        return result
+
+    def _process_vertices(self, arrays):
+        self.vertices = self._to_blender_space(
+            to_numpy_array(arrays.Positions, numpy.float32))
+        self.normals = self._to_blender_space(
+            to_numpy_array(arrays.Normals, numpy.float32))
 
-            nrm = vert.Normal
-            self.normals.append(Vector((nrm.X, -nrm.Z, nrm.Y)))
+        if not self.output.is_weighted:
+            return
 
-            if vert.Weights is not None:
-                for weight_index, weight in enumerate(vert.Weights):
-                    if weight > 0:
-                        self.output.weights[weight_index].append(
-                            (index, weight))
+        group_num = self.output.weights.shape[1]
+        weights = numpy.zeros(
+            (len(self.vertices), group_num), dtype=numpy.float32)
 
-    def _process_corner(self, corner: any):
-        uv = corner.Texcoord
-        self.uvs.append((uv.X, 1 - uv.Y))
+        if arrays.Weights is not None:
+            count = min(arrays.WeightCount, group_num)
+            weights[:, :count] = to_numpy_array(
+                arrays.Weights, numpy.float32).reshape(
+                    -1, arrays.WeightCount)[:, :count]
 
-        color = corner.Color
-        color = (color.RedF, color.GreenF, color.BlueF, color.AlphaF)
-        color = srgb_to_linear(color)
-        self.colors.append(color)
+        self.output.weights = weights
 
-    def _process_polygons(self):
-        for cornerset in self.weighted_buffer.TriangleSets:
-            for index in range(0, len(cornerset), 3):
-                c1 = cornerset[index]
-                c2 = cornerset[index+1]
-                c3 = cornerset[index+2]
+    def _process_polygons(self, arrays):
+        self.corners = to_numpy_array(arrays.CornerVertexIndices, numpy.int32)
 
-                self.polygons.append((
-                    c1.VertexIndex,
-                    c2.VertexIndex,
-                    c3.VertexIndex))
+        self.uvs = to_numpy_array(
+            arrays.CornerTexcoords, numpy.float32).reshape(-1, 2)
+        self.uvs[:, 1] = 1 - self.uvs[:, 1]
 
-                self._process_corner(c1)
-                self._process_corner(c2)
-                self._process_corner(c3)
+        self.colors = srgb_to_linear_array(to_numpy_array(
+            arrays.CornerColors, numpy.float32).reshape(-1, 4))
 
-            self.poly_material_lengths.append(len(cornerset) / 3)
+        self.poly_material_lengths = [
+            length // 3 for length in arrays.CornerSetLengths]
 
     def _process_materials(self):
 
         for material in self.weighted_buffer.Materials:
-            hashcode = material.GetHashCode()
-            if hashcode in self.material_lut:
-                bpy_material = self.material_lut[hashcode]
+            properties = self._get_material_properties(material)
+            key = tuple(properties.values())
+
+            if key in self.material_lut:
+                bpy_material = self.material_lut[key]
             else:
-                bpy_material = self._net_to_bpy_material(
-                    material, f"{self.mat_name}_{len(self.material_lut)}")
-                self.material_lut[hashcode] = bpy_material
+                bpy_material = self._create_bpy_material(
+                    properties, f"{self.mat_name}_{len(self.material_lut)}")
+                self.material_lut[key] = bpy_material
+                self._new_materials.append(bpy_material)
 
             self.materials.append(bpy_material)
 
     #########################################################
 
     def _setup_mesh_polygons(self):
-        if len(self.poly_material_lengths) > 1:
+        mesh = self.output.mesh
 
-            poly_mat_index = 0
-            next_material_offset = self.poly_material_lengths[poly_mat_index]
-
-            for i, polygon in enumerate(self.output.mesh.polygons):
-
-                if i >= next_material_offset:
-                    poly_mat_index += 1
-                    next_material_offset += self.poly_material_lengths[poly_mat_index]
-
-                polygon.use_smooth = self.import_normals
-                polygon.material_index = poly_mat_index
+        if len(self.poly_material_lengths) > 1:
+            material_indices = numpy.repeat(
+                numpy.arange(len(self.poly_material_lengths), dtype=numpy.int32),
+                self.poly_material_lengths)
+            mesh.polygons.foreach_set("material_index", material_indices)
 
+        # Faces are smooth unless flagged in the sharp face attribute
+        sharp_face = mesh.attributes.get("sharp_face")
+        if self.import_normals:
+            if sharp_face is not None:
+                mesh.attributes.remove(sharp_face)
         else:
-            for polygon in self.output.mesh.polygons:
-                polygon.use_smooth = self.import_normals
+            if sharp_face is None:
+                sharp_face = mesh.attributes.new("sharp_face", 'BOOLEAN', 'FACE')
+            sharp_face.data.foreach_set(
+                "value", numpy.ones(len(mesh.polygons), dtype=bool))
 
     def _setup_mesh_normals(self):
         if self.import_normals:
@@ -222,17 +250,33 @@ class MeshProcessor:
             color_attributes = self.output.mesh.color_attributes.new(
                 "Color", 'FLOAT_COLOR', 'CORNER')
 
-            for i, color in enumerate(self.colors):
-                color_attributes.data[i].color = color
+            color_attributes.data.foreach_set("color", self.colors.ravel())
 
     def _setup_mesh_uvs(self):
         uv_layer = self.output.mesh.uv_layers.new(name="UV")
-        for i, uv in enumerate(self.uvs):
-            uv_layer.data[i].uv = uv
+        uv_layer.data.foreach_set("uv", self.uvs.ravel())
+
+    def _setup_mesh_geometry(self):
+        # Filling the mesh in bulk instead of going through from_pydata,
+        # which writes every element on its own
+        mesh = self.output.mesh
+        corner_count = len(self.corners)
+
+        mesh.vertices.add(len(self.vertices))
+        mesh.vertices.foreach_set("co", self.vertices.ravel())
+
+        mesh.loops.add(corner_count)
+        mesh.loops.foreach_set("vertex_index", self.corners)
+
+        mesh.polygons.add(corner_count // 3)
+        mesh.polygons.foreach_set(
+            "loop_start", numpy.arange(0, corner_count, 3, dtype=numpy.int32))
+
+        mesh.update(calc_edges=True)
 
     def _create_mesh(self):
         self.output.mesh = bpy.data.meshes.new(self.name)
-        self.output.mesh.from_pydata(self.vertices, [], self.polygons)
+        self._setup_mesh_geometry()
         self.output.mesh.saio_mesh.texcoord_precision_level = self.weighted_buffer.TexcoordPrecisionLevel
 
         for mat in self.materials:
@@ -259,8 +303,11 @@ class MeshProcessor:
         self._setup_buffers()
         self._setup_output()
 
-        self._process_vertices()
-        self._process_polygons()
+        # reading the mesh as flat arrays, instead of accessing every
+        # vertex and corner through pythonnet
+        arrays = SAIO_NET.MODEL.GetMeshArrays(weighted_buffer)
+        self._process_vertices(arrays)
+        self._process_polygons(arrays)
         self._process_materials()
 
         self._create_mesh()
@@ -291,8 +338,10 @@ class MeshProcessor:
         return result
 
     def setup_materials(self, context: bpy.types.Context):
+        '''Sets up the materials created since the last call'''
         material_setup.setup_and_update_materials(
-            context, self.material_lut.values())
+            context, self._new_materials)
+        self._new_materials = []
 
     @staticmethod
     def process_meshes(
@@ -300,9 +349,10 @@ class MeshProcessor:
             weighted_buffers,
             name: str,
             mat_name: str | None = None,
-            auto_normals: bool = True):
+            auto_normals: bool = True,
+            material_lut: dict[tuple, bpy.types.Material] | None = None):
 
-        processor = MeshProcessor(auto_normals)
+        processor = MeshProcessor(auto_normals, material_lut)
         result = processor.process_multiple(weighted_buffers, name, mat_name)
         processor.setup_materials(context)
         return result
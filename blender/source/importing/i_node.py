@@ -1,4 +1,5 @@
 import bpy
+import numpy
 from mathutils import Matrix, Vector, Quaternion
 
 from . import i_enum, i_matrix, i_mesh, i_texture
@@ -32,14 +33,16 @@ class NodeProcessor:
             auto_normals: bool,
             all_weighted_meshes: bool,
             merge_meshes: bool,
-            node_name_lut: dict[str, str] | None = None):
+            node_name_lut: dict[str, str] | None = None,
+            material_lut: dict[tuple, bpy.types.Material] | None = None):
 
         self._context = context
         self._collection = collection
         self._ensure_order = ensure_order
         self._all_weighted_meshes = all_weighted_meshes
         self._merge_meshes = merge_meshes
-        self._mesh_processor = i_mesh.MeshProcessor(auto_normals)
+        self._mesh_processor = i_mesh.MeshProcessor(
+            auto_normals, material_lut)
 
         self.object_map = {}
         self.meshes = []
@@ -216,13 +219,24 @@ class NodeProcessor:
 
         if meshdata.is_weighted:
 
-            for bone_index, bone_weights in enumerate(meshdata.weights):
-                if len(bone_weights) == 0:
+            for bone_index, bone_weights in enumerate(meshdata.weights.T):
+                vertex_indices = numpy.flatnonzero(bone_weights > 0)
+                if len(vertex_indices) == 0:
                     continue
+
                 bone_name = self._bone_map[bone_index + node_index]
                 weight_group = mesh_obj.vertex_groups.new(name=bone_name)
-                for vertex_index, weight in bone_weights:
-                    weight_group.add([vertex_index], weight, 'REPLACE')
+
+                # adding all vertices that share a weight at once
+                values, value_indices = numpy.unique(
+                    bone_weights[vertex_indices], return_inverse=True)
+                order = numpy.argsort(value_indices, kind="stable")
+                splits = numpy.cumsum(numpy.bincount(value_indices))[:-1]
+
+                for value, value_vertices in zip(
+                        values.tolist(),
+                        numpy.split(vertex_indices[order], splits)):
+                    weight_group.add(value_vertices.tolist(), value, 'REPLACE')
 
         else:
             bone_name = self._bone_map[node_index]
@@ -426,7 +440,8 @@ class NodeProcessor:
             auto_normals: bool = True,
             all_weighted_meshes: bool = False,
             merge_meshes: bool = False,
-            ensure_order: bool = True):
+            ensure_order: bool = True,
+            material_lut: dict[tuple, bpy.types.Material] | None = None):
 
         node_processor = NodeProcessor(
             context,
@@ -435,7 +450,8 @@ class NodeProcessor:
             auto_normals,
             all_weighted_meshes,
             merge_meshes,
-            node_name_lut
+            node_name_lut,
+            material_lut
         )
 
         result = node_processor.process(import_data, name, mat_name, force_armature)
@@ -1,18 +1,94 @@
+import os
+import hashlib
 import bpy
+import numpy
 from ..dotnet import SA3D_Texturing, SAIO_NET
+from ..dotnet.buffers import to_numpy_array
+
+
+def to_float_pixels(pixels: numpy.ndarray):
+    '''Converts the 8 bit RGBA colors of a texture to a flat float32 array'''
+    return pixels.astype(numpy.float32) * numpy.float32(1 / 255)
+
+
+def _create_image(name: str, width: int, height: int, pixels: numpy.ndarray):
+    img = bpy.data.images.new(name, width, height, alpha=True)
+    img.pixels.foreach_set(to_float_pixels(pixels))
+    img.update()
+    return img
+
+
+def _get_cache_filepath(
+        cache_directory: str,
+        width: int,
+        height: int,
+        pixels: numpy.ndarray):
+
+    hasher = hashlib.blake2b(digest_size=16)
+    hasher.update(numpy.array((width, height), dtype=numpy.int32).tobytes())
+    hasher.update(pixels.tobytes())
+    return os.path.join(cache_directory, hasher.hexdigest() + ".png")
+
+
+def _load_cached_image(
+        name: str,
+        width: int,
+        height: int,
+        pixels: numpy.ndarray,
+        cache_directory: str):
+
+    filepath = _get_cache_filepath(cache_directory, width, height, pixels)
+
+    if not os.path.isfile(filepath):
+        os.makedirs(cache_directory, exist_ok=True)
+
+        # written to a temporary file first, so that an interrupted write
+        # never leaves a broken image in the cache
+        temp_filepath = filepath[:-4] + f".{os.getpid()}.tmp.png"
+        img = _create_image(name, width, height, pixels)
+        try:
+            img.filepath_raw = temp_filepath
+            img.file_format = 'PNG'
+            img.save()
+        finally:
+            bpy.data.images.remove(img)
+
+        os.replace(temp_filepath, filepath)
+
+    img = bpy.data.images.load(bpy.path.relpath(filepath))
+    img.name = name
+    return img
+
+
+def process_texture_set(
+        texture_set,
+        texture_list,
+        cache_directory: str | None = None):
+    '''Creates images and texture slots for every texture in the set.
+
+    With a cache directory, the textures are stored as PNG files named
+    after their content and referenced as external images instead of
+    being packed into the .blend file'''
 
-def process_texture_set(texture_set, texture_list):
     for texture in texture_set.Textures:
-        img = bpy.data.images.new(
-            texture.Name,
-            texture.Width,
-            texture.Height,
-            alpha=True)
-
-        img.pixels = SAIO_NET.TEXTURE.GetData(texture)
-        img.update()
+        # only the 8 bit colors get copied over; converting them to floats
+        # happens here, so that the float pixels dont exist in .NET too
+        pixels = to_numpy_array(
+            SAIO_NET.TEXTURE.GetColorBytes(texture, True), numpy.uint8)
+
+        if cache_directory is None:
+            img = _create_image(
+                texture.Name, texture.Width, texture.Height, pixels)
+            img.pack()
+        else:
+            img = _load_cached_image(
+                texture.Name,
+                texture.Width,
+                texture.Height,
+                pixels,
+                cache_directory)
+
         img.use_fake_user = True
-        img.pack()
 
         tex = texture_list.new(name=texture.Name, image=img)
         tex.global_index = SAIO_NET.TEXTURE.ToSigned(texture.GlobalIndex)
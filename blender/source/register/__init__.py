@@ -9,6 +9,8 @@ from . import (
 )
 
 from ..dotnet import unload_dotnet
+from ..exporting.o_mesh_cache import clear_mesh_cache
+from ..exporting.o_texture_cache import get_texture_cache
 
 classes = []
 
@@ -17,6 +19,17 @@ classes.extend(operators.to_register)
 classes.extend(ui.to_register)
 
 
+def _clear_caches():
+    clear_mesh_cache()
+    get_texture_cache().clear()
+
+
+@bpy.app.handlers.persistent
+def _on_load_post(*_):
+    # the cached conversions most likely belong to the previous file
+    _clear_caches()
+
+
 def register():
     """Loading API classes into blender"""
 
@@ -28,11 +41,16 @@ def register():
             cls.register()
 
     bpy.utils.register_manual_map(manual.add_manual_map)
+    bpy.app.handlers.load_post.append(_on_load_post)
 
 
 def unregister():
     """Unloading classes loaded in register(), as well as various cleanup"""
 
+    if _on_load_post in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(_on_load_post)
+
+    _clear_caches()
     unload_dotnet()
 
     bpy.utils.unregister_manual_map(manual.add_manual_map)
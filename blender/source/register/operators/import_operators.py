@@ -1,4 +1,6 @@
 import os
+from concurrent.futures import ThreadPoolExecutor
+
 import bpy
 from bpy.props import (
     BoolProperty,
@@ -14,6 +16,30 @@ from .base import SAIOBaseFileLoadOperator
 from ...dotnet import load_dotnet, SAIO_NET
 
 
+def _import_prefetched(import_file, filepaths: list[str]):
+    '''Yields (filepath, import data) for every file, while already parsing
+    the next file on a worker thread. Parsing does not touch blender data,
+    so it can run while the current file gets set up in blender'''
+
+    if len(filepaths) == 0:
+        return
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        future = executor.submit(import_file, filepaths[0])
+
+        for index, filepath in enumerate(filepaths):
+            try:
+                import_data = future.result()
+            except Exception as error:
+                print(f"An error occured while importing {os.path.basename(filepath)}")
+                raise error
+
+            if index + 1 < len(filepaths):
+                future = executor.submit(import_file, filepaths[index + 1])
+
+            yield filepath, import_data
+
+
 class ModelImportOperator(SAIOBaseFileLoadOperator):
     bl_options = {'PRESET', 'UNDO'}
 
@@ -129,20 +155,28 @@ class SAIO_OT_Import_Model(ModelImportOperator):
         from ...importing import i_node
 
         scene = context.scene
-        for file in self.files:
 
-            filepath = os.path.join(directory, file.name)
-            try:
-                import_data = SAIO_NET.MODEL.Import(
-                    filepath, self.optimize, self.flip_vertex_colors)
-            except Exception as error:
-                print(f"An error occured while importing {file.name}")
-                raise error
+        # materials are shared between the files imported into one scene
+        material_lut = {}
+
+        filepaths = [os.path.join(directory, file.name) for file in self.files]
+
+        # operator properties should not be accessed from the worker thread
+        optimize = self.optimize
+        flip_vertex_colors = self.flip_vertex_colors
 
-            name = os.path.splitext(file.name)[0]
+        def import_file(filepath: str):
+            return SAIO_NET.MODEL.Import(
+                filepath, optimize, flip_vertex_colors)
+
+        for filepath, import_data in _import_prefetched(import_file, filepaths):
+            filename = os.path.basename(filepath)
+
+            name = os.path.splitext(filename)[0]
             if self.scene_per_file:
                 scene = bpy.data.scenes.new(name)
                 context.window.scene = scene
+                material_lut = {}
 
             scene.saio_scene.author = import_data.Author
             scene.saio_scene.description = import_data.Description
@@ -154,14 +188,15 @@ class SAIO_OT_Import_Model(ModelImportOperator):
                 context,
                 import_data,
                 collection,
-                file.name,
+                filename,
                 None,
                 None,
                 self.import_as_armature,
                 self.auto_normals,
                 self.all_weighted_meshes,
                 self.merge_meshes,
-                self.ensure_order
+                self.ensure_order,
+                material_lut
             )
 
         return {'FINISHED'}
@@ -306,19 +341,24 @@ class SAIO_OT_Import_Landtable(ModelImportOperator):
         load_dotnet()
         from ...importing import i_landtable
 
-        for file in self.files:
-            filepath = os.path.join(directory, file.name)
+        # materials are shared between the files imported into one scene
+        material_lut = {}
 
-            try:
-                import_data = SAIO_NET.LANDTABLE_WRAPPER.Import(
-                    filepath, self.optimize)
-            except Exception as error:
-                print(f"An error occured while importing {file.name}")
-                raise error
+        filepaths = [os.path.join(directory, file.name) for file in self.files]
+
+        # operator properties should not be accessed from the worker thread
+        optimize = self.optimize
+
+        def import_file(filepath: str):
+            return SAIO_NET.LANDTABLE_WRAPPER.Import(filepath, optimize)
+
+        for filepath, import_data in _import_prefetched(import_file, filepaths):
+            filename = os.path.basename(filepath)
 
             if self.scene_per_file:
-                scene = bpy.data.scenes.new(file.name)
+                scene = bpy.data.scenes.new(filename)
                 context.window.scene = scene
+                material_lut = {}
 
             if self.fix_view:
                 context.space_data.clip_start = 1.0
@@ -327,7 +367,7 @@ class SAIO_OT_Import_Landtable(ModelImportOperator):
             i_landtable.LandtableProcessor.process_landtable(
                 context,
                 import_data,
-                file.name,
+                filename,
                 self.optimize,
                 self.auto_normals,
                 self.ensure_static_order,
@@ -336,7 +376,8 @@ class SAIO_OT_Import_Landtable(ModelImportOperator):
                 self.ensure_order,
                 self.rotation_mode,
                 self.quaternion_threshold,
-                self.short_rot)
+                self.short_rot,
+                material_lut)
 
         return {'FINISHED'}
 
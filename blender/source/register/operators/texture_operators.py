@@ -19,6 +19,7 @@ from .base import (
 from ..property_groups.texture_properties import SAIO_TextureList
 from ...exporting import o_texture
 from ...dotnet import load_dotnet, SA3D_Texturing, SA3D_Archival
+from ...utility.general import get_cache_directory
 
 
 class TextureOperator(SAIOBaseOperator):
@@ -90,9 +91,23 @@ class SAIO_OT_Textures_Autoname(TextureOperator):
 
 class TextureImportOperator(TextureOperator, SAIOBaseFileLoadOperator):
 
+    use_disk_cache: BoolProperty(
+        name="Cache On Disk",
+        description=(
+            "Store the textures as images in a cache folder next to the .blend"
+            " file instead of packing them into it. Textures that are already"
+            " in the cache get reused. Requires the .blend file to be saved"
+        ),
+        default=False
+    )
+
     def _get_texture_set(self):
         raise NotImplementedError()
 
+    def draw(self, context):
+        super().draw(context)
+        self.layout.prop(self, "use_disk_cache")
+
     def list_execute( # pylint: disable=unused-argument
             self,
             context: bpy.types.Context,
@@ -106,8 +121,17 @@ class TextureImportOperator(TextureOperator, SAIOBaseFileLoadOperator):
             self.report({'WARNING'}, "File is not valid!")
             return {'CANCELLED'}
 
+        cache_directory = None
+        if self.use_disk_cache:
+            cache_directory = get_cache_directory("textures")
+            if cache_directory is None:
+                self.report(
+                    {'WARNING'},
+                    "The .blend file has not been saved yet; Packing textures instead")
+
         from ...importing import i_texture
-        i_texture.process_texture_set(texture_set, texture_list)
+        i_texture.process_texture_set(
+            texture_set, texture_list, cache_directory)
 
 
 class SAIO_OT_Textures_Import_Pack(TextureImportOperator):
@@ -146,6 +170,10 @@ class TextureExportOperator(TextureOperator, SAIOBaseFileSaveOperator):
     def _save_texture_set(self, texture_set): # pylint: disable=unused-argument
         raise NotImplementedError()
 
+    def _save_texture_list(self, texture_list: SAIO_TextureList):
+        texture_set = o_texture.create_texture_set(texture_list)
+        self._save_texture_set(texture_set)
+
     def check(self, context):
         extension = self._get_extension()
         no_ext, old_extension = os.path.splitext(self.filepath)
@@ -161,9 +189,7 @@ class TextureExportOperator(TextureOperator, SAIOBaseFileSaveOperator):
             context: bpy.types.Context,
             texture_list: SAIO_TextureList):
         load_dotnet()
-
-        texture_set = o_texture.create_texture_set(texture_list)
-        self._save_texture_set(texture_set)
+        self._save_texture_list(texture_list)
 
 
 class SAIO_OT_Textures_Export_Archive(TextureExportOperator):
@@ -203,10 +229,10 @@ class SAIO_OT_Textures_Export_Archive(TextureExportOperator):
 
         return result
 
-    def _save_texture_set(self, texture_set):
+    def _save_texture_list(self, texture_list: SAIO_TextureList):
 
-        o_texture.save_texture_archive(
-            texture_set,
+        o_texture.export_texture_archive(
+            texture_list,
             self.filepath,
             self.archive_type,
             self.compress)
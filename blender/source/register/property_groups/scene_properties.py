@@ -80,6 +80,16 @@ class SAIO_Scene(bpy.types.PropertyGroup):
         update=_update_material_outputs
     )
 
+    mesh_cache_on_disk: BoolProperty(
+        name="Cache Meshes On Disk",
+        description=(
+            "Keep converted meshes in a cache folder next to the .blend"
+            " file, so that unchanged meshes dont need to be converted"
+            " again on export, even after restarting blender"
+        ),
+        default=False
+    )
+
     checked_for_migrate_data: BoolProperty()
     found_migrate_data: BoolProperty(default=True)
 
@@ -40,6 +40,7 @@ class SAIO_PT_Scene(PropertiesPanel):
         layout.prop(setting_properties, "description")
         layout.prop(setting_properties, "scene_type")
         layout.prop(setting_properties, "use_principled")
+        layout.prop(setting_properties, "mesh_cache_on_disk")
 
         SAIO_PT_Scene.draw_lighting_panel(
             layout,
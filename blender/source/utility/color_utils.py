@@ -1,3 +1,6 @@
+import numpy
+
+
 def _srgb2lin(s):
     if s <= 0.0404482362771082:
         lin = s / 12.92
@@ -40,3 +43,41 @@ def srgb_to_linear(color: tuple[float, float, float, float]):
             _srgb2lin(color[0]),
             _srgb2lin(color[1]),
             _srgb2lin(color[2]))
+
+
+def _convert_rgb_array(colors: numpy.ndarray, function):
+    # Converting in double precision like the scalar functions do, so that
+    # the float32 results match them
+    result = numpy.array(colors, dtype=numpy.float64).reshape(
+        -1, numpy.shape(colors)[-1])
+    result[:, :3] = function(result[:, :3])
+    return result.astype(numpy.float32)
+
+
+def _srgb2lin_array(s: numpy.ndarray):
+    return numpy.where(
+        s <= 0.0404482362771082,
+        s / 12.92,
+        numpy.power(
+            (numpy.maximum(s, 0.0404482362771082) + 0.055) / 1.055, 2.4))
+
+
+def _lin2srgb_array(lin: numpy.ndarray):
+    return numpy.where(
+        lin > 0.0031308,
+        1.055 * numpy.power(numpy.maximum(lin, 0.0031308), 1.0 / 2.4) - 0.055,
+        12.92 * lin)
+
+
+def linear_to_srgb_array(colors: numpy.ndarray):
+    '''Converts an (N, 3) or (N, 4) array of linear colors to sRGB.
+    Alpha is left untouched'''
+
+    return _convert_rgb_array(colors, _lin2srgb_array)
+
+
+def srgb_to_linear_array(colors: numpy.ndarray):
+    '''Converts an (N, 3) or (N, 4) array of sRGB colors to linear.
+    Alpha is left untouched'''
+
+    return _convert_rgb_array(colors, _srgb2lin_array)
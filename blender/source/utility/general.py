@@ -24,6 +24,20 @@ def compare_path(a: str, b: str):
     return a == absolute
 
 
+def get_cache_directory(name: str):
+    '''Returns the path of a cache directory next to the opened .blend file,
+    or None if the file has not been saved yet'''
+
+    if not bpy.data.filepath:
+        return None
+
+    blend_dir, blend_name = os.path.split(bpy.data.filepath)
+    return os.path.join(
+        blend_dir,
+        os.path.splitext(blend_name)[0] + "_saio_cache",
+        name)
+
+
 def load_template_blend(context: bpy.types.Context):
     lib_path = get_template_path()
 
@@ -176,5 +176,26 @@ namespace SAIO.NET
 
             return new Model(node, meshes, textureNames, weighted, author, desription);
         }
+
+        public static MeshArrayStruct GetMeshArrays(WeightedMesh mesh)
+        {
+            return MeshArrayStruct.FromWeightedMesh(mesh);
+        }
+
+        public static float[] GetVectorArray(IEnumerable<Vector3> vectors)
+        {
+            Vector3[] source = vectors.ToArray();
+            float[] result = new float[source.Length * 3];
+
+            for(int i = 0; i < source.Length; i++)
+            {
+                int offset = i * 3;
+                result[offset] = source[i].X;
+                result[offset + 1] = source[i].Y;
+                result[offset + 2] = source[i].Z;
+            }
+
+            return result;
+        }
     }
 }
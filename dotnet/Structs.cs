@@ -4,6 +4,7 @@ using SA3D.Modeling.Mesh.Weighted;
 using SA3D.Modeling.ObjectData;
 using SA3D.Modeling.ObjectData.Enums;
 using SA3D.Modeling.Structs;
+using System;
 using System.Numerics;
 
 
@@ -107,6 +108,86 @@ namespace SAIO.NET
             NoBounds = noBounds;
         }
 
+        public static MeshStruct FromArrays(
+            string label,
+            float[] positions,
+            float[] normals,
+            float[]? weights,
+            int weightCount,
+            int[] cornerVertexIndices,
+            float[] cornerTexcoords,
+            float[] cornerColors,
+            int[] cornerSetLengths,
+            BufferMaterial[] materials,
+            int rootNodeIndex,
+            bool hasVertexColors,
+            bool forceVertexColors,
+            byte texcoordPrecisionLevel,
+            bool noBounds)
+        {
+            return new(
+                label,
+                CreateVertices(positions, normals, weights, weightCount),
+                CreateCorners(cornerVertexIndices, cornerTexcoords, cornerColors, cornerSetLengths),
+                materials,
+                rootNodeIndex,
+                hasVertexColors,
+                forceVertexColors,
+                texcoordPrecisionLevel,
+                noBounds);
+        }
+
+        public static BufferCorner[][] CreateCorners(int[] vertexIndices, float[] texcoords, float[] colors, int[] setLengths)
+        {
+            BufferCorner[][] result = new BufferCorner[setLengths.Length][];
+            int cornerIndex = 0;
+
+            for(int i = 0; i < setLengths.Length; i++)
+            {
+                BufferCorner[] corners = new BufferCorner[setLengths[i]];
+
+                for(int j = 0; j < corners.Length; j++, cornerIndex++)
+                {
+                    int texcoordOffset = cornerIndex * 2;
+                    int colorOffset = cornerIndex * 4;
+
+                    corners[j] = new(
+                        checked((ushort)vertexIndices[cornerIndex]),
+                        new Color(colors[colorOffset], colors[colorOffset + 1], colors[colorOffset + 2], colors[colorOffset + 3]),
+                        new Vector2(texcoords[texcoordOffset], texcoords[texcoordOffset + 1]));
+                }
+
+                result[i] = corners;
+            }
+
+            return result;
+        }
+
+        public static WeightedVertex[] CreateVertices(float[] positions, float[] normals, float[]? weights, int weightCount)
+        {
+            WeightedVertex[] result = new WeightedVertex[positions.Length / 3];
+
+            for(int i = 0; i < result.Length; i++)
+            {
+                int offset = i * 3;
+                Vector3 position = new(positions[offset], positions[offset + 1], positions[offset + 2]);
+                Vector3 normal = new(normals[offset], normals[offset + 1], normals[offset + 2]);
+
+                if(weights == null)
+                {
+                    result[i] = new(position, normal);
+                }
+                else
+                {
+                    WeightedVertex vertex = new(position, normal, weightCount);
+                    Array.Copy(weights, i * weightCount, vertex.Weights!, 0, weightCount);
+                    result[i] = vertex;
+                }
+            }
+
+            return result;
+        }
+
         public readonly WeightedMesh ToWeightedBuffer(bool writeSpecular)
         {
             WeightedMesh wba = WeightedMesh.Create(Vertices, Corners, Materials, HasVertexColors, true);
@@ -122,4 +203,102 @@ namespace SAIO.NET
         }
     }
 
+    public readonly struct MeshArrayStruct
+    {
+        public float[] Positions { get; }
+        public float[] Normals { get; }
+        public float[]? Weights { get; }
+        public int WeightCount { get; }
+        public int[] CornerVertexIndices { get; }
+        public float[] CornerTexcoords { get; }
+        public float[] CornerColors { get; }
+        public int[] CornerSetLengths { get; }
+
+        public MeshArrayStruct(float[] positions, float[] normals, float[]? weights, int weightCount, int[] cornerVertexIndices, float[] cornerTexcoords, float[] cornerColors, int[] cornerSetLengths)
+        {
+            Positions = positions;
+            Normals = normals;
+            Weights = weights;
+            WeightCount = weightCount;
+            CornerVertexIndices = cornerVertexIndices;
+            CornerTexcoords = cornerTexcoords;
+            CornerColors = cornerColors;
+            CornerSetLengths = cornerSetLengths;
+        }
+
+        public static MeshArrayStruct FromWeightedMesh(WeightedMesh mesh)
+        {
+            WeightedVertex[] vertices = mesh.Vertices;
+
+            float[] positions = new float[vertices.Length * 3];
+            float[] normals = new float[vertices.Length * 3];
+
+            int weightCount = 0;
+            if(mesh.IsWeighted)
+            {
+                foreach(WeightedVertex vertex in vertices)
+                {
+                    weightCount = Math.Max(weightCount, vertex.Weights?.Length ?? 0);
+                }
+            }
+
+            float[]? weights = weightCount > 0 ? new float[vertices.Length * weightCount] : null;
+
+            for(int i = 0; i < vertices.Length; i++)
+            {
+                WeightedVertex vertex = vertices[i];
+                int offset = i * 3;
+
+                positions[offset] = vertex.Position.X;
+                positions[offset + 1] = vertex.Position.Y;
+                positions[offset + 2] = vertex.Position.Z;
+
+                normals[offset] = vertex.Normal.X;
+                normals[offset + 1] = vertex.Normal.Y;
+                normals[offset + 2] = vertex.Normal.Z;
+
+                if(weights != null && vertex.Weights != null)
+                {
+                    Array.Copy(vertex.Weights, 0, weights, i * weightCount, vertex.Weights.Length);
+                }
+            }
+
+            int[] setLengths = new int[mesh.TriangleSets.Length];
+            int cornerCount = 0;
+            for(int i = 0; i < setLengths.Length; i++)
+            {
+                setLengths[i] = mesh.TriangleSets[i].Length;
+                cornerCount += setLengths[i];
+            }
+
+            int[] cornerVertexIndices = new int[cornerCount];
+            float[] texcoords = new float[cornerCount * 2];
+            float[] colors = new float[cornerCount * 4];
+
+            int cornerIndex = 0;
+            foreach(BufferCorner[] corners in mesh.TriangleSets)
+            {
+                foreach(BufferCorner corner in corners)
+                {
+                    int texcoordOffset = cornerIndex * 2;
+                    int colorOffset = cornerIndex * 4;
+
+                    cornerVertexIndices[cornerIndex] = corner.VertexIndex;
+
+                    texcoords[texcoordOffset] = corner.Texcoord.X;
+                    texcoords[texcoordOffset + 1] = corner.Texcoord.Y;
+
+                    colors[colorOffset] = corner.Color.RedF;
+                    colors[colorOffset + 1] = corner.Color.GreenF;
+                    colors[colorOffset + 2] = corner.Color.BlueF;
+                    colors[colorOffset + 3] = corner.Color.AlphaF;
+
+                    cornerIndex++;
+                }
+            }
+
+            return new(positions, normals, weights, weightCount, cornerVertexIndices, texcoords, colors, setLengths);
+        }
+    }
+
 }
@@ -6,35 +6,53 @@ namespace SAIO.NET
 {
     public static class Texture
     {
-        public static float[] GetData(Image texture)
+        public static byte[] GetColorBytes(Image texture, bool flipRows)
         {
-            const float factor = 1 / (float)byte.MaxValue;
             ReadOnlySpan<byte> pixels = texture.GetColorPixels();
-            float[] result = new float[pixels.Length];
+            if(!flipRows)
+            {
+                return pixels.ToArray();
+            }
 
-            int destIndex = 0;
+            byte[] result = new byte[pixels.Length];
             int pixRowSize = texture.Width * 4;
-            for(int y = texture.Height - 1; y >= 0; y--)
+
+            for(int y = 0; y < texture.Height; y++)
             {
-                ReadOnlySpan<byte> row = pixels[(y * pixRowSize)..];
-                for(int x = 0; x < pixRowSize; x++)
-                {
-                    result[destIndex] = row[x] * factor;
-                    destIndex++;
-                }
+                int sourceRow = (texture.Height - 1 - y) * pixRowSize;
+                pixels.Slice(sourceRow, pixRowSize).CopyTo(result.AsSpan(y * pixRowSize, pixRowSize));
             }
 
             return result;
         }
 
-        public static Image Create(string name, int globalIndex, int width, int height, bool? index4, float[] colors)
+        public static Image FromPixelData(string name, int globalIndex, int width, int height, bool? index4, byte[] pixelData)
+        {
+            uint unsignedGlobalIndex = unchecked((uint)globalIndex);
+
+            if(index4 == null)
+            {
+                return new ColorTexture(width, height, pixelData, name, unsignedGlobalIndex);
+            }
+
+            return new IndexTexture(width, height, pixelData, name, unsignedGlobalIndex)
+            {
+                IsIndex4 = index4.Value
+            };
+        }
+
+        public static unsafe byte[] CreatePixelData(int width, int height, bool? index4, long colorsAddress)
+        {
+            // Reading the pixels straight from the callers (pinned) float buffer, so that they dont have to be marshalled
+            ReadOnlySpan<float> source = new((void*)colorsAddress, width * height * 4);
+            return CreatePixelData(width, height, index4, source);
+        }
+
+        private static byte[] CreatePixelData(int width, int height, bool? index4, ReadOnlySpan<float> source)
         {
-            ReadOnlySpan<float> source = colors;
             int destIndex = 0;
             int pixRowSize = width * 4;
 
-            uint unsignedGlobalIndex = unchecked((uint)globalIndex);
-
             if(index4 == null)
             {
                 byte[] pixelData = new byte[width * height * 4];
@@ -49,7 +67,7 @@ namespace SAIO.NET
                     }
                 }
 
-                return new ColorTexture(width, height, pixelData, name, unsignedGlobalIndex);
+                return pixelData;
             }
             else
             {
@@ -69,10 +87,7 @@ namespace SAIO.NET
                     }
                 }
 
-                return new IndexTexture(width, height, pixelData, name, unsignedGlobalIndex)
-                {
-                    IsIndex4 = index4.Value
-                };
+                return pixelData;
             }
         }
     